@@ -4,21 +4,37 @@
 """
 import json
 import datetime as dt
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import uuid
 
+import profiles
+from profiles import READABLE, FAST
+from stream_io import ChunkedWriter, iter_records, write_record, DEFAULT_CHUNK_SIZE
+from traversal import traverse, DFS
+
 
 class Person:
     def __init__(self, name: str, born_in: dt.datetime) -> None:
         self._name = name
-        self._friends: List['Person'] = []
+        # dict как упорядоченное множество друзей
+        self._friends: Dict['Person', None] = {}
         self._born_in = born_in
         self._id = str(uuid.uuid4())
 
     def add_friend(self, friend: 'Person') -> None:
         if friend not in self._friends:
-            self._friends.append(friend)
-            friend._friends.append(self)
+            self._friends[friend] = None
+            friend._friends[self] = None
+
+
+def _to_dict(p: Person) -> Dict[str, Any]:
+    """Запись человека - ПРЯМОЙ ДОСТУП к приватным полям, нарушение инкапсуляции!"""
+    return {
+        'id': p._id,
+        'name': p._name,  # Напрямую!
+        'born_in': p._born_in.isoformat(),  # Напрямую!
+        'friends': [f._id for f in p._friends]  # Напрямую!
+    }
 
 
 class DirectAccessSerializer:
@@ -28,39 +44,42 @@ class DirectAccessSerializer:
     """
 
     @staticmethod
-    def encode(person: Person) -> bytes:
-        """Кодирует с прямым доступом к полям"""
-        all_objects: List[Dict[str, Any]] = []
-        visited_ids = set()
-
-        def collect(p: Person):
-            if p._id in visited_ids:
-                return
-
-            visited_ids.add(p._id)
-
-            # ПРЯМОЙ ДОСТУП к приватным полям - нарушение инкапсуляции!
-            obj_data = {
-                'id': p._id,
-                'name': p._name,  # Напрямую!
-                'born_in': p._born_in.isoformat(),  # Напрямую!
-                'friends': [f._id for f in p._friends]  # Напрямую!
-            }
-            all_objects.append(obj_data)
-
-            # Рекурсивно собираем друзей
-            for friend in p._friends:  # Напрямую!
-                collect(friend)
-
-        collect(person)
+    def encode(person: Person, order: str = DFS, profile: str = READABLE) -> bytes:
+        """Кодирует с прямым доступом к полям (order: DFS или BFS, profile: READABLE или FAST)"""
+        profiles.check_profile(profile)
+        if profile == FAST:
+            return profiles.dump_fast([
+                [p._id, p._name, profiles.encode_date(p._born_in), [f._id for f in p._friends]]
+                for p in traverse(person, lambda p: p._id, lambda p: p._friends, order)
+            ])
+
+        # Обход без рекурсии, соседи берутся напрямую из _friends
+        all_objects: List[Dict[str, Any]] = [
+            _to_dict(p) for p in traverse(person, lambda p: p._id, lambda p: p._friends, order)
+        ]
+
         return json.dumps(all_objects, indent=2).encode('utf-8')
 
     @staticmethod
     def decode(data: bytes) -> Person:
-        """Декодирует с прямым доступом к полям"""
-        objects_data = json.loads(data.decode('utf-8'))
+        """Декодирует с прямым доступом к полям (профиль определяется сам)"""
+        objects_data, fast = profiles.load(data)
         obj_cache: Dict[str, Person] = {}
 
+        if fast:
+            records = profiles.fast_records(objects_data)
+            if not records:
+                raise ValueError("Граф не содержит ни одного человека")
+            for person_id, name, born_in, _ in records:
+                obj = Person.__new__(Person)
+                obj._id = person_id
+                obj._name = name
+                obj._born_in = born_in
+                obj_cache[person_id] = obj
+            for person_id, _, _, friend_ids in records:
+                obj_cache[person_id]._friends = dict.fromkeys(obj_cache[friend_id] for friend_id in friend_ids)
+            return obj_cache[records[0][0]]
+
         # Фаза 1: Создаем объекты
         for obj_data in objects_data:
             obj = Person.__new__(Person)
@@ -68,17 +87,48 @@ class DirectAccessSerializer:
             obj._id = obj_data['id']
             obj._name = obj_data['name']
             obj._born_in = dt.datetime.fromisoformat(obj_data['born_in'])
-            obj._friends = []  # Пока пустой список
+            obj._friends = {}  # Пока пустой
             obj_cache[obj._id] = obj
 
         # Фаза 2: Восстанавливаем связи
         for obj_data in objects_data:
             obj = obj_cache[obj_data['id']]
             # Прямой доступ для восстановления связей
-            obj._friends = [obj_cache[friend_id] for friend_id in obj_data['friends']]
+            obj._friends = dict.fromkeys(obj_cache[friend_id] for friend_id in obj_data['friends'])
 
         return obj_cache[objects_data[0]['id']]
 
+    @staticmethod
+    def dump(person: Person, fileobj: Any, compression: Optional[str] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE, order: str = DFS) -> int:
+        """Пишет граф кусками (по желанию со сжатием), по записи на человека"""
+        count = 0
+        with ChunkedWriter(fileobj, compression, chunk_size) as writer:
+            for p in traverse(person, lambda p: p._id, lambda p: p._friends, order):
+                write_record(writer, _to_dict(p))
+                count += 1
+        return count
+
+    @staticmethod
+    def load(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Person:
+        """Читает граф, записанный dump; в памяти только объекты и id друзей"""
+        obj_cache: Dict[str, Person] = {}
+        links: List[Tuple[Person, List[str]]] = []
+        for obj_data in iter_records(fileobj, chunk_size):
+            obj = Person.__new__(Person)
+            obj._id = obj_data['id']
+            obj._name = obj_data['name']
+            obj._born_in = dt.datetime.fromisoformat(obj_data['born_in'])
+            obj._friends = {}
+            obj_cache[obj._id] = obj
+            links.append((obj, obj_data['friends']))
+        if not links:
+            raise ValueError("Поток не содержит ни одной записи")
+
+        for obj, friend_ids in links:
+            obj._friends = dict.fromkeys(obj_cache[friend_id] for friend_id in friend_ids)
+        return links[0][0]
+
 
 # === Пример использования ===
 if __name__ == "__main__":
@@ -113,4 +163,5 @@ if __name__ == "__main__":
 
     print(f"\nС циклической ссылкой:")
     print(f"У {recreated2._name} друзей: {len(recreated2._friends)}")
-    print(f"У {recreated2._friends[1]._name} тоже есть друг: {recreated2._friends[1]._friends[0]._name}")
+    second_friend = list(recreated2._friends)[1]
+    print(f"У {second_friend._name} тоже есть друг: {next(iter(second_friend._friends))._name}")
@@ -3,23 +3,78 @@
 Класс Person предоставляет публичные методы для сериализации/десериализации
 """
 import json
+import sys
 import datetime as dt
-from typing import Dict, List, Any, Optional
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, KeysView, Iterable, BinaryIO, Tuple, Union
 import uuid
 
+import profiles
+from epoch import pack_date, unpack_date
+from profiles import READABLE, FAST
+from traversal import traverse, DFS
+from sharding import encode_shards, decode_shards
+from stream_io import ChunkedWriter, iter_lines, DEFAULT_CHUNK_SIZE
+
+
+def person_record(person_id: str, name: str, born_in: dt.datetime,
+                  friend_ids: List[str]) -> Dict[str, Any]:
+    """Запись человека в формате PersonSerializer (профиль READABLE)"""
+    return {
+        'type': 'Person',
+        'id': person_id,
+        'name': name,
+        'born_in': born_in.isoformat(),
+        'friends': friend_ids
+    }
+
+
+def compact_record(person_id: str, name: str, born_in: dt.datetime,
+                   friend_ids: List[str]) -> List[Any]:
+    """Запись для быстрого профиля: [id, имя, дата, id друзей]"""
+    return [person_id, name, profiles.encode_date(born_in), friend_ids]
+
 
 class Person:
+    # Журнал изменений (Snapshot), если граф под наблюдением
+    _tracker: Optional['Snapshot'] = None
+
     def __init__(self, name: str, born_in: dt.datetime) -> None:
         self._name = name
-        self._friends: List['Person'] = []
+        # dict как упорядоченное множество: порядок добавления и проверка за O(1)
+        self._friends: Dict['Person', None] = {}
         self._born_in = born_in
         self._id = str(uuid.uuid4())  # Уникальный ID для обработки ссылок
 
     def add_friend(self, friend: 'Person') -> None:
         """Добавляет друга (взаимная связь)"""
         if friend not in self._friends:
-            self._friends.append(friend)
-            friend._friends.append(self)
+            self._friends[friend] = None
+            friend._friends[self] = None
+            tracker = self._tracker or friend._tracker
+            if tracker is not None:
+                tracker._on_link(self, friend, True)
+
+    def remove_friend(self, friend: 'Person') -> None:
+        """Удаляет друга (с обеих сторон)"""
+        if friend in self._friends:
+            del self._friends[friend]
+            friend._friends.pop(self, None)
+            tracker = self._tracker or friend._tracker
+            if tracker is not None:
+                tracker._on_link(self, friend, False)
+
+    def set_name(self, name: str) -> None:
+        """Сеттер для имени"""
+        self._name = name
+        if self._tracker is not None:
+            self._tracker._touch(self)
+
+    def set_birth_date(self, born_in: dt.datetime) -> None:
+        """Сеттер для даты рождения"""
+        self._born_in = born_in
+        if self._tracker is not None:
+            self._tracker._touch(self)
 
     def get_name(self) -> str:
         """Геттер для имени"""
@@ -29,9 +84,17 @@ class Person:
         """Геттер для даты рождения"""
         return self._born_in
 
+    def get_id(self) -> str:
+        """Геттер для ID"""
+        return self._id
+
     def get_friends(self) -> List['Person']:
         """Геттер для списка друзей"""
-        return self._friends.copy()  # Возвращаем копию для защиты от изменений
+        return list(self._friends)  # Возвращаем копию для защиты от изменений
+
+    def friends_view(self) -> KeysView['Person']:
+        """Представление друзей только для чтения, без копирования"""
+        return self._friends.keys()
 
     # === Методы для сериализации ===
 
@@ -40,13 +103,13 @@ class Person:
         Конвертирует объект в словарь для сериализации.
         Не нарушает инкапсуляцию - использует геттеры.
         """
-        return {
-            'type': 'Person',
-            'id': self._id,
-            'name': self.get_name(),
-            'born_in': self.get_birth_date().isoformat(),
-            'friends': [friend._id for friend in self.get_friends()]
-        }
+        return person_record(self._id, self.get_name(), self.get_birth_date(),
+                             [friend._id for friend in self.friends_view()])
+
+    def to_compact_record(self) -> List[Any]:
+        """Запись для быстрого профиля: [id, имя, дата, id друзей]"""
+        return compact_record(self._id, self.get_name(), self.get_birth_date(),
+                              [friend._id for friend in self.friends_view()])
 
     @classmethod
     def from_serializable_dict(cls, data: Dict[str, Any],
@@ -67,7 +130,7 @@ class Person:
         obj._id = data['id']
         obj._name = data['name']
         obj._born_in = dt.datetime.fromisoformat(data['born_in'])
-        obj._friends = []
+        obj._friends = {}
 
         # Сохраняем в кэш
         obj_cache[data['id']] = obj
@@ -82,40 +145,318 @@ class Person:
         for data in data_list:
             obj = obj_cache[data['id']]
             # Восстанавливаем друзей
-            obj._friends = [obj_cache[friend_id] for friend_id in data['friends']]
+            obj._friends = dict.fromkeys(obj_cache[friend_id] for friend_id in data['friends'])
 
 
-class PersonSerializer:
-    """Класс для сериализации/десериализации объектов Person"""
+class SlottedPerson:
+    """
+    Экономная по памяти версия Person с тем же интерфейсом.
+    Без __dict__ (__slots__), UUID хранится числом, имя интернируется,
+    дата - целым числом микросекунд. Кодируется теми же encode,
+    encode_stream/dump, encode_sharded, BinaryPersonSerializer и
+    GraphFile.write (декодируются всегда в Person). Журнал изменений
+    (snapshot/encode_delta) - только для Person.
+    """
 
-    @staticmethod
-    def encode(person: Person) -> bytes:
-        """Кодирует объект Person в байты (JSON)"""
-        # Собираем все объекты в графе
-        objects_to_save: List[Dict[str, Any]] = []
-        visited_ids: set = set()
+    __slots__ = ('_name', '_friends', '_born_in', '_id')
+
+    def __init__(self, name: str, born_in: dt.datetime) -> None:
+        self._name = sys.intern(name)
+        self._friends: Dict['SlottedPerson', None] = {}
+        self._born_in = pack_date(born_in)
+        self._id = uuid.uuid4().int
+
+    def add_friend(self, friend: 'SlottedPerson') -> None:
+        """Добавляет друга (взаимная связь)"""
+        if friend not in self._friends:
+            self._friends[friend] = None
+            friend._friends[self] = None
+
+    def get_id(self) -> str:
+        return str(uuid.UUID(int=self._id))
 
-        def collect_objects(p: Person):
-            if p._id in visited_ids:
-                return
+    def get_name(self) -> str:
+        return self._name
+
+    def get_birth_date(self) -> dt.datetime:
+        return unpack_date(self._born_in)
+
+    def get_friends(self) -> List['SlottedPerson']:
+        return list(self._friends)
+
+    def friends_view(self) -> KeysView['SlottedPerson']:
+        return self._friends.keys()
+
+    def to_serializable_dict(self) -> Dict[str, Any]:
+        """Тот же словарь, что и у Person"""
+        return person_record(self.get_id(), self._name, self.get_birth_date(),
+                             [friend.get_id() for friend in self._friends])
+
+    def to_compact_record(self) -> List[Any]:
+        """Запись для быстрого профиля, как у Person"""
+        return compact_record(self.get_id(), self._name, self.get_birth_date(),
+                              [friend.get_id() for friend in self._friends])
+
+
+class LazyPerson(Person):
+    """
+    Заместитель Person для ленивого декодирования.
+    Хранит только id и смещение своей записи в источнике; имя, дата
+    рождения и друзья (тоже заместители) разбираются при первом обращении.
+    """
+
+    _LAZY_FIELDS = frozenset(('_name', '_born_in', '_friends'))
+
+    def __init__(self, graph: 'LazyGraph', person_id: str, offset: Optional[int] = None) -> None:
+        self._graph = graph
+        self._id = person_id
+        self._offset = offset
+
+    def __getattr__(self, name: str) -> Any:
+        # Вызывается только для отсутствующих атрибутов
+        if name in LazyPerson._LAZY_FIELDS and '_graph' in self.__dict__:
+            self._materialise()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def is_loaded(self) -> bool:
+        """Разобрана ли уже запись этого человека"""
+        return '_name' in self.__dict__
+
+    # Сеттеры сначала разбирают запись, иначе разбор при первом обращении
+    # к друзьям затер бы новое значение
+    def set_name(self, name: str) -> None:
+        if not self.is_loaded():
+            self._materialise()
+        super().set_name(name)
+
+    def set_birth_date(self, born_in: dt.datetime) -> None:
+        if not self.is_loaded():
+            self._materialise()
+        super().set_birth_date(born_in)
+
+    def _materialise(self) -> None:
+        graph = self._graph
+        if self._offset is None:
+            self._offset = graph.locate(self._id)
+        data = graph.load(self._offset)
+        self._name = data['name']
+        self._born_in = dt.datetime.fromisoformat(data['born_in'])
+        self._friends = dict.fromkeys(graph.proxy(friend_id) for friend_id in data['friends'])
+
+
+class LazyGraph(ABC):
+    """
+    Источник записей для LazyPerson.
+    Наследники умеют находить смещение записи по id и разбирать запись
+    по смещению; заместители кэшируются, поэтому у каждого id один объект.
+    """
+
+    def __init__(self) -> None:
+        self._proxies: Dict[str, LazyPerson] = {}
+
+    def proxy(self, person_id: str, offset: Optional[int] = None) -> LazyPerson:
+        obj = self._proxies.get(person_id)
+        if obj is None:
+            obj = self._proxies[person_id] = LazyPerson(self, person_id, offset)
+        return obj
+
+    @abstractmethod
+    def locate(self, person_id: str) -> int:
+        """Смещение записи человека по id"""
+
+    @abstractmethod
+    def load(self, offset: int) -> Dict[str, Any]:
+        """Запись (словарь PersonSerializer) по смещению"""
+
+
+class _JsonLazyGraph(LazyGraph):
+    """
+    Ленивый источник поверх байтов PersonSerializer.encode.
+    Записи разбираются по одной с нужного смещения; смещения людей,
+    которых еще не встречали, ищутся просмотром вперед по массиву,
+    каждая запись просматривается не больше одного раза.
+    """
+
+    _SEPARATORS = b' \t\r\n,'
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self._data = data
+        self._decoder = json.JSONDecoder()
+        self._offsets: Dict[str, int] = {}
+        if profiles.is_fast(data):
+            raise ValueError("Ленивое декодирование поддерживает только профиль READABLE")
+        start = self._skip(0)
+        if start >= len(data) or data[start:start + 1] != b'[':
+            raise ValueError("Ожидался JSON-массив записей Person")
+        self._scan_pos = self._skip(start + 1)
+
+    def _skip(self, pos: int) -> int:
+        data = self._data
+        while pos < len(data) and data[pos] in self._SEPARATORS:
+            pos += 1
+        return pos
+
+    def _parse(self, offset: int) -> Tuple[Dict[str, Any], int]:
+        """Разбирает запись с offset, возвращает ее и байтовое смещение конца"""
+        size = 4096
+        while True:
+            chunk = self._data[offset:offset + size]
+            try:
+                text = chunk.decode('utf-8')
+            except UnicodeDecodeError as error:
+                # Окно разрезало многобайтовый символ в конце
+                if error.start < len(chunk) - 3:
+                    raise
+                text = chunk[:error.start].decode('utf-8')
+            try:
+                record, end = self._decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                if offset + size >= len(self._data):
+                    raise ValueError(f"Поврежденная запись по смещению {offset}") from None
+                size *= 4
+                continue
+            return record, offset + len(text[:end].encode('utf-8'))
+
+    def root(self) -> LazyPerson:
+        if self._data[self._scan_pos:self._scan_pos + 1] == b']':
+            raise ValueError("Массив записей пуст")
+        record, _ = self._parse(self._scan_pos)
+        return self.proxy(record['id'], self._scan_pos)
+
+    def locate(self, person_id: str) -> int:
+        offset = self._offsets.get(person_id)
+        while offset is None:
+            pos = self._scan_pos
+            if pos >= len(self._data) or self._data[pos:pos + 1] == b']':
+                raise ValueError(f"Ссылка на отсутствующего человека: {person_id}")
+            record, end = self._parse(pos)
+            self._offsets[record['id']] = pos
+            self._scan_pos = self._skip(end)
+            if record['id'] == person_id:
+                offset = pos
+        return offset
+
+    def load(self, offset: int) -> Dict[str, Any]:
+        return self._parse(offset)[0]
+
+
+class Snapshot:
+    """
+    Контрольная точка графа и журнал изменений после нее.
+    При создании помечает всех людей графа (один проход), дальше
+    изменения Person сами попадают в журнал: измененные люди и
+    итоговые добавления/удаления связей (добавить и удалить = ничего).
+    """
+
+    def __init__(self, root: Person) -> None:
+        self.seq = 0
+        self._dirty: Dict[str, Person] = {}
+        self._edges: Dict[Tuple[str, str], bool] = {}  # связь -> True добавлена, False удалена
+        for p in traverse(root, lambda p: p._id, lambda p: p.friends_view()):
+            if not isinstance(p, Person):
+                raise TypeError(f"Отслеживать изменения можно только у Person, а не {type(p).__name__}")
+            p._tracker = self
+
+    def has_changes(self) -> bool:
+        return bool(self._dirty or self._edges)
+
+    def _touch(self, person: Person) -> None:
+        self._dirty[person._id] = person
+
+    def _edge(self, a: Person, b: Person, added: bool) -> None:
+        key = (a._id, b._id) if a._id <= b._id else (b._id, a._id)
+        if self._edges.get(key, added) != added:
+            del self._edges[key]
+        else:
+            self._edges[key] = added
+
+    def _adopt(self, person: Person) -> None:
+        """Берет под наблюдение нового человека и всех новых, связанных с ним"""
+        stack = [person]
+        while stack:
+            p = stack.pop()
+            if p._tracker is self:
+                continue
+            p._tracker = self
+            self._touch(p)
+            for friend in p.friends_view():
+                # Каждая связь записывается, когда обходится первый ее конец
+                if friend._tracker is not self:
+                    self._edge(p, friend, True)
+                    stack.append(friend)
+
+    def _on_link(self, a: Person, b: Person, added: bool) -> None:
+        for p in (a, b):
+            if p._tracker is not self:
+                self._adopt(p)
+        self._edge(a, b, added)
+
+    def _take_changes(self) -> Dict[str, Any]:
+        """Забирает накопленные изменения и начинает новый интервал"""
+        changes = {
+            'type': 'PersonDelta',
+            'base': self.seq,
+            'seq': self.seq + 1,
+            'people': [{'id': p._id, 'name': p._name, 'born_in': p._born_in.isoformat()}
+                       for p in self._dirty.values()],
+            'added': [list(key) for key, added in self._edges.items() if added],
+            'removed': [list(key) for key, added in self._edges.items() if not added],
+        }
+        self._dirty = {}
+        self._edges = {}
+        self.seq += 1
+        return changes
 
-            visited_ids.add(p._id)
-            objects_to_save.append(p.to_serializable_dict())
 
-            # Рекурсивно собираем друзей
-            for friend in p.get_friends():
-                collect_objects(friend)
+class DeltaIndex(Dict[str, Person]):
+    """
+    Индекс id -> Person графа, к которому применяются дельты,
+    и номер последней примененной дельты (seq, 0 - полный снимок).
+    """
 
-        collect_objects(person)
+    def __init__(self, people: Iterable[Tuple[str, Person]] = (), seq: int = 0) -> None:
+        super().__init__(people)
+        self.seq = seq
+
+
+class PersonSerializer:
+    """Класс для сериализации/десериализации объектов Person"""
+
+    @staticmethod
+    def encode(person: Person, order: str = DFS, profile: str = READABLE) -> bytes:
+        """
+        Кодирует объект Person в байты (JSON).
+        order задает порядок обхода графа: DFS (по умолчанию) или BFS.
+        profile=FAST - компактный JSON с датами-числами (см. profiles).
+        """
+        profiles.check_profile(profile)
+        if profile == FAST:
+            return profiles.dump_fast([
+                p.to_compact_record()
+                for p in traverse(person, lambda p: p._id, Person.friends_view, order)
+            ])
+
+        # Собираем все объекты в графе (обход без рекурсии)
+        objects_to_save: List[Dict[str, Any]] = [
+            p.to_serializable_dict()
+            for p in traverse(person, lambda p: p._id, Person.friends_view, order)
+        ]
 
         # Сериализуем в JSON
         return json.dumps(objects_to_save, indent=2).encode('utf-8')
 
     @staticmethod
     def decode(data: bytes) -> Person:
-        """Декодирует байты в объект Person"""
+        """Декодирует байты в объект Person (профиль определяется сам)"""
         # Парсим JSON
-        objects_data = json.loads(data.decode('utf-8'))
+        objects_data, fast = profiles.load(data)
+        if fast:
+            records = profiles.fast_records(objects_data)
+            if not records:
+                raise ValueError("Граф не содержит ни одного человека")
+            return PersonSerializer._from_records(records, records[0][0])
 
         # Создаем кэш для объектов
         obj_cache: Dict[str, Person] = {}
@@ -130,6 +471,208 @@ class PersonSerializer:
         # Возвращаем первый объект (корневой)
         return obj_cache[objects_data[0]['id']]
 
+    @staticmethod
+    def decode_lazy(data: bytes) -> Person:
+        """
+        Ленивое декодирование: возвращает заместителя корня, разобрав
+        только его запись. Остальные люди разбираются при первом обращении
+        к их имени, дате или друзьям. Байты должны жить, пока граф используется.
+        Только для профиля READABLE (записи быстрого профиля не адресуются по смещению).
+        """
+        return _JsonLazyGraph(data).root()
+
+    # === Шардированный режим (кодирование в пуле процессов) ===
+
+    @staticmethod
+    def encode_sharded(person: Person, shards: int = 4,
+                       processes: Optional[int] = None, order: str = DFS) -> bytes:
+        """
+        Делит людей в порядке обхода на шарды и кодирует шарды параллельно:
+        записи строят рабочие процессы, здесь выполняется только обход.
+        Друзья из других шардов хранятся по id.
+        """
+        people = list(traverse(person, lambda p: p._id, lambda p: p.friends_view(), order))
+        return encode_shards(people, PersonSerializer._shard_record, person.get_id(), shards, processes)
+
+    @staticmethod
+    def _shard_record(p: Person) -> Tuple[str, str, dt.datetime, List[str]]:
+        # Через геттеры: подходит и SlottedPerson
+        return (p.get_id(), p.get_name(), p.get_birth_date(),
+                [friend.get_id() for friend in p.friends_view()])
+
+    @staticmethod
+    def decode_sharded(data: bytes, processes: Optional[int] = None) -> Person:
+        """Разбирает шарды параллельно, затем связывает людей между шардами"""
+        root_id, records = decode_shards(data, processes)
+        return PersonSerializer._from_records(records, root_id)
+
+    @staticmethod
+    def _from_records(records: List[Tuple[str, str, dt.datetime, List[str]]], root_id: str) -> Person:
+        """Строит граф из записей (id, имя, дата, id друзей)"""
+        # Фаза 1: объекты (для шардов - из всех шардов)
+        obj_cache: Dict[str, Person] = {}
+        for person_id, name, born_in, _ in records:
+            obj = Person.__new__(Person)
+            obj._id = person_id
+            obj._name = name
+            obj._born_in = born_in
+            obj_cache[person_id] = obj
+
+        # Фаза 2: связи, в том числе между шардами
+        lookup = obj_cache.__getitem__
+        for person_id, _, _, friend_ids in records:
+            obj_cache[person_id]._friends = dict.fromkeys(map(lookup, friend_ids))
+        return obj_cache[root_id]
+
+    # === Инкрементальные снимки ===
+
+    @staticmethod
+    def snapshot(person: Person) -> Snapshot:
+        """
+        Начинает отслеживать изменения графа. Полный снимок на этот
+        момент снимается обычным encode, дальше - только encode_delta.
+        """
+        return Snapshot(person)
+
+    @staticmethod
+    def encode_delta(since: Snapshot) -> bytes:
+        """
+        Кодирует изменения после последней контрольной точки: измененных
+        и новых людей (без друзей) и добавленные/удаленные связи.
+        Стоимость O(число изменений); snapshot переходит к следующей точке.
+        """
+        return json.dumps(since._take_changes(), separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def apply_delta(person: Person, delta: bytes,
+                    index: Optional[DeltaIndex] = None) -> DeltaIndex:
+        """
+        Применяет изменения к ранее декодированному графу.
+        Возвращает индекс id -> Person с номером примененной дельты;
+        следующую дельту нужно применять с ним: это стоит O(число изменений),
+        а устаревшая или повторная дельта отклоняется. Без индекса граф
+        считается полным снимком (seq 0), индекс строится обходом графа.
+        Дельта сначала целиком проверяется: при ошибке граф не меняется.
+        Порядок друзей может отличаться от исходного, состав друзей совпадает.
+        """
+        changes = json.loads(delta)
+        if changes.get('type') != 'PersonDelta':
+            raise ValueError("Это не дельта графа Person")
+        if index is None:
+            index = DeltaIndex((p._id, p) for p in traverse(person, lambda p: p._id, Person.friends_view))
+        if changes['base'] != index.seq:
+            raise ValueError(f"Дельта к версии {changes['base']}, а граф в версии {index.seq}")
+
+        # Проверка до изменений
+        people = [(data, dt.datetime.fromisoformat(data['born_in'])) for data in changes['people']]
+        new_ids = {data['id'] for data, _ in people}
+        for a_id, b_id in changes['removed'] + changes['added']:
+            for person_id in (a_id, b_id):
+                if person_id not in index and person_id not in new_ids:
+                    raise ValueError(f"Дельта ссылается на неизвестного человека: {person_id}")
+
+        for data, born_in in people:
+            obj = index.get(data['id'])
+            if obj is None:
+                Person.from_serializable_dict(data, index)
+            else:
+                obj._name = data['name']
+                obj._born_in = born_in
+
+        for a_id, b_id in changes['removed']:
+            a, b = index[a_id], index[b_id]
+            a._friends.pop(b, None)
+            b._friends.pop(a, None)
+        for a_id, b_id in changes['added']:
+            a, b = index[a_id], index[b_id]
+            a._friends[b] = None
+            b._friends[a] = None
+        index.seq = changes['seq']
+        return index
+
+    # === Потоковый режим (NDJSON: одна компактная JSON-запись на строку) ===
+
+    @staticmethod
+    def encode_stream(person: Person, fp: BinaryIO, order: str = DFS) -> int:
+        """
+        Пишет граф в файловый объект по одной записи на человека
+        по ходу обхода, не собирая весь результат в памяти.
+        Возвращает число записанных людей.
+        """
+        count = 0
+        for p in traverse(person, lambda p: p._id, Person.friends_view, order):
+            line = json.dumps(p.to_serializable_dict(), separators=(',', ':'))
+            fp.write(line.encode('utf-8') + b'\n')
+            count += 1
+        return count
+
+    @staticmethod
+    def decode_stream(fp: Iterable[Union[bytes, str]]) -> Person:
+        """
+        Читает граф построчно (файл или любой итератор строк).
+        Ссылки на еще не прочитанных друзей откладываются в таблицу
+        ожидающих связей и заполняются, когда появляется сам друг,
+        поэтому в памяти хранится только граф объектов и недостроенные списки.
+        """
+        obj_cache: Dict[str, Person] = {}
+        # id еще не прочитанного друга -> (кто его ждет, позиция в списке друзей)
+        pending: Dict[str, List[Tuple[Person, int]]] = {}
+        # человек -> [список друзей с пропусками, число пропусков]
+        waiting: Dict[Person, List[Any]] = {}
+        root: Optional[Person] = None
+
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            obj = Person.from_serializable_dict(data, obj_cache)
+            if root is None:
+                root = obj
+
+            # Друзья, которые уже прочитаны, подставляются сразу
+            friend_ids = data['friends']
+            slots = [obj_cache.get(friend_id) for friend_id in friend_ids]
+            missing = 0
+            for i, friend_id in enumerate(friend_ids):
+                if slots[i] is None:
+                    pending.setdefault(friend_id, []).append((obj, i))
+                    missing += 1
+            if missing:
+                waiting[obj] = [slots, missing]
+            else:
+                obj._friends = dict.fromkeys(slots)
+
+            # Заполняем списки тех, кто ждал этого человека
+            for waiter, i in pending.pop(obj._id, ()):
+                state = waiting[waiter]
+                state[0][i] = obj
+                state[1] -= 1
+                if state[1] == 0:
+                    waiter._friends = dict.fromkeys(state[0])
+                    del waiting[waiter]
+
+        if root is None:
+            raise ValueError("Поток не содержит ни одной записи")
+        if pending:
+            raise ValueError(f"Ссылки на отсутствующих людей: {sorted(pending)[:5]}")
+        return root
+
+    @staticmethod
+    def dump(person: Person, fileobj: Any, compression: Optional[str] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE, order: str = DFS) -> int:
+        """
+        Пишет граф в файл/сокет кусками по chunk_size байт, по желанию
+        со сжатием ('zlib', 'lzma', 'bz2'). Возвращает число людей.
+        """
+        with ChunkedWriter(fileobj, compression, chunk_size) as writer:
+            return PersonSerializer.encode_stream(person, writer, order)
+
+    @staticmethod
+    def load(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Person:
+        """Читает граф, записанный dump; сжатие определяется само"""
+        return PersonSerializer.decode_stream(iter_lines(fileobj, chunk_size))
+
 
 # === Пример использования ===
 if __name__ == "__main__":
@@ -160,3 +703,24 @@ if __name__ == "__main__":
     print(f"\nС циклической ссылкой: друзей у {recreated2.get_name()}: {len(recreated2.get_friends())}")
     print(
         f"У друга {recreated2.get_friends()[1].get_name()} тоже есть друзья: {len(recreated2.get_friends()[1].get_friends())}")
+
+    # Потоковый режим: по строке на человека
+    import io
+    stream = io.BytesIO()
+    serializer.encode_stream(p1, stream)
+    stream.seek(0)
+    recreated3 = serializer.decode_stream(stream)
+    print(f"\nПотоковый режим: {recreated3.get_name()}, друзей: {len(recreated3.get_friends())}")
+
+    # Ленивый режим: разбирается только то, к чему обратились
+    lazy_root = serializer.decode_lazy(encoded2)
+    print(f"Ленивый режим: {lazy_root.get_name()}, друг загружен: {lazy_root.get_friends()[0].is_loaded()}")
+
+    # Инкрементальные снимки: после полного снимка передаются только изменения
+    snapshot = serializer.snapshot(p1)
+    copy = serializer.decode(serializer.encode(p1))
+    p2.set_name("Pyotr")
+    p2.remove_friend(p1)
+    delta = serializer.encode_delta(since=snapshot)
+    serializer.apply_delta(copy, delta)
+    print(f"Дельта: {len(delta)} байт, у {copy.get_name()} теперь друзей: {len(copy.get_friends())}")
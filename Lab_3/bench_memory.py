@@ -0,0 +1,80 @@
+"""
+Сравнение памяти: Person / FunctionalPerson против экономных версий
+с __slots__. Считает байты на человека и байты на связь (tracemalloc).
+
+Запуск:
+    python bench_memory.py              # 10^6 человек, по 5 связей
+    python bench_memory.py --people 100000 --degree 10
+"""
+import argparse
+import datetime as dt
+import gc
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from OOp import Person, SlottedPerson
+from funct import FunctionalPerson, SlottedFunctionalPerson
+from graph_generators import random_graph
+
+CLASSES: Dict[str, Callable[[str, dt.datetime], Any]] = {
+    'Person': Person,
+    'SlottedPerson': SlottedPerson,
+    'FunctionalPerson': FunctionalPerson,
+    'SlottedFunctionalPerson': SlottedFunctionalPerson,
+}
+
+
+def measure(cls: Callable[[str, dt.datetime], Any], people: int, degree: int,
+            seed: int) -> Dict[str, float]:
+    """Строит граф и возвращает байты на человека и на связь"""
+    rng = random.Random(seed)
+    start_date = dt.datetime(1950, 1, 1)
+    days = [rng.randrange(25000) for _ in range(people)]
+    pairs = random_graph(people, rng, degree)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        # Имена повторяются, но это разные объекты строк, как после чтения из файла
+        persons: List[Any] = [cls(f"name{i % 1000}", start_date + dt.timedelta(days=days[i]))
+                              for i in range(people)]
+        gc.collect()
+        after_people, _ = tracemalloc.get_traced_memory()
+
+        edges = 0
+        for a, b in pairs:
+            if a != b and persons[b] not in persons[a].friends_view():
+                persons[a].add_friend(persons[b])
+                edges += 1
+        gc.collect()
+        after_edges, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    list_overhead = 8 * people  # сам список persons
+    return {
+        'people': people,
+        'edges': edges,
+        'bytes_per_person': (after_people - base - list_overhead) / people,
+        'bytes_per_edge': (after_edges - after_people) / edges if edges else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Память на человека и на связь")
+    parser.add_argument('--people', type=int, default=1_000_000)
+    parser.add_argument('--degree', type=int, default=5, help="средняя степень")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"=== Память: {args.people} человек, средняя степень {args.degree} ===")
+    print(f"{'класс':<26}{'байт/человек':>14}{'байт/связь':>12}")
+    for name, cls in CLASSES.items():
+        result = measure(cls, args.people, args.degree, args.seed)
+        print(f"{name:<26}{result['bytes_per_person']:>14.1f}{result['bytes_per_edge']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Бенчмарк четырех подходов к сериализации Lab_3:
+    oop        - PersonSerializer (OOp.py)
+    direct     - DirectAccessSerializer (00p.2.py)
+    functional - encode/decode_functional_encapsulated (funct.py)
+    pure       - encode/decode_pure_functional (funct2.py)
+
+Графы генерируются синтетически (см. graph_generators): random, powerlaw,
+chain, cliques; параметры --degree и --clique.
+
+Для каждого кодека измеряются время кодирования и декодирования,
+размер результата в байтах и пиковая память (tracemalloc).
+С --hotspots выводятся самые дорогие функции (cProfile) и строки
+(tracemalloc). Результаты сохраняются в JSON и сравниваются с эталоном.
+
+Запуск:
+    python bench_serializers.py --output results.json
+    python bench_serializers.py --sizes 100 1000000 --graphs powerlaw --codecs pure
+    python bench_serializers.py --baseline results.json --threshold 0.15
+"""
+import argparse
+import cProfile
+import datetime as dt
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import OOp
+import funct
+import funct2
+from graph_generators import GENERATORS, Edges, make_people, build_objects
+from profiles import READABLE, FAST
+
+# 00p.2.py нельзя импортировать обычным import из-за точки в имени
+_spec = importlib.util.spec_from_file_location(
+    'direct_access', os.path.join(os.path.dirname(os.path.abspath(__file__)), '00p.2.py'))
+direct_access = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(direct_access)
+
+DEFAULT_SIZES = (100, 1000, 10000)
+GRAPHS = tuple(GENERATORS)
+CODECS = ('oop', 'direct', 'functional', 'pure')
+
+
+# === Построение графа для каждого кодека ===
+
+def _build_dicts(people: List[Tuple[str, dt.datetime]], edges: Edges) -> List[Dict[str, Any]]:
+    # add_friend_dict ищет индексы линейно, поэтому связи заполняем напрямую
+    persons = [funct2.create_person_dict(name, born_in) for name, born_in in people]
+    seen = set()
+    for a, b in edges:
+        if a != b and (a, b) not in seen:
+            seen.add((a, b))
+            seen.add((b, a))
+            persons[a]['friends'].append(b)
+            persons[b]['friends'].append(a)
+    return persons
+
+
+def make_codec(codec: str, people: List[Tuple[str, dt.datetime]], edges: Edges,
+               profile: str) -> Tuple[Callable[[], bytes], Callable[[bytes], Any]]:
+    """Строит граф и возвращает (кодирование без аргументов, декодирование)"""
+    if codec == 'oop':
+        root = build_objects(OOp.Person, people, edges)[0]
+        return (lambda: OOp.PersonSerializer.encode(root, profile=profile),
+                OOp.PersonSerializer.decode)
+    if codec == 'direct':
+        root = build_objects(direct_access.Person, people, edges)[0]
+        return (lambda: direct_access.DirectAccessSerializer.encode(root, profile=profile),
+                direct_access.DirectAccessSerializer.decode)
+    if codec == 'functional':
+        root = build_objects(funct.FunctionalPerson, people, edges)[0]
+        return (lambda: funct.encode_functional_encapsulated(root, profile=profile),
+                lambda data: funct.decode_functional_encapsulated(data, funct.FunctionalPerson))
+    persons = _build_dicts(people, edges)
+    return (lambda: funct2.encode_pure_functional(persons, profile=profile),
+            funct2.decode_pure_functional)
+
+
+# === Измерения ===
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Лучшее время одного вызова из repeat, с"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        del result
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Пиковая память одного вызова сверх уже занятой, байт"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - base
+
+
+def hotspots(func: Callable[[], Any], top: int) -> Dict[str, List[str]]:
+    """Самые дорогие функции (cProfile) и строки по памяти (tracemalloc)"""
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('tottime').print_stats(top)
+    # Оставляем только строки таблицы
+    lines = out.getvalue().splitlines()
+    header = next(i for i, line in enumerate(lines) if line.lstrip().startswith('ncalls'))
+    functions = [line for line in lines[header + 1:] if line.strip()]
+
+    tracemalloc.start()
+    try:
+        result = func()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    allocations = [str(stat) for stat in snapshot.statistics('lineno')[:top]]
+    return {'cpu': functions, 'memory': allocations}
+
+
+def run_benchmarks(graphs: List[str], sizes: List[int], codecs: List[str], profile: str,
+                   repeat: int, seed: int, degree: int, clique: int,
+                   top: int = 0) -> List[Dict[str, Any]]:
+    """Прогоняет все сочетания граф/размер/кодек"""
+    results = []
+    for graph in graphs:
+        for size in sizes:
+            # Одинаковое зерно -> одинаковый граф для всех кодеков
+            rng = random.Random(f"{seed}:{graph}:{size}")
+            edges = GENERATORS[graph](size, rng, degree=degree, clique=clique)
+            people = make_people(size, rng)
+            for codec in codecs:
+                encode, decode = make_codec(codec, people, edges, profile)
+                data = encode()
+                result = {
+                    'codec': codec,
+                    'graph': graph,
+                    'size': size,
+                    'edges': len(edges),
+                    'profile': profile,
+                    'encode_s': best_time(encode, repeat),
+                    'decode_s': best_time(lambda: decode(data), repeat),
+                    'bytes': len(data),
+                    'encode_peak_bytes': peak_memory(encode),
+                    'decode_peak_bytes': peak_memory(lambda: decode(data)),
+                }
+                if top:
+                    result['hotspots'] = {'encode': hotspots(encode, top),
+                                          'decode': hotspots(lambda: decode(data), top)}
+                results.append(result)
+                print_row(result)
+    return results
+
+
+# === Отчет и сравнение ===
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, str, int, str]:
+    return result['codec'], result['graph'], result['size'], result['profile']
+
+
+def compare_with_baseline(results: List[Dict[str, Any]],
+                          baseline: List[Dict[str, Any]],
+                          threshold: float) -> List[str]:
+    """
+    Сравнивает результаты с эталоном.
+    Возвращает список описаний регрессий (пустой, если их нет).
+    """
+    baseline_by_key = {result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = baseline_by_key.get(result_key(result))
+        if old is None:
+            continue
+        name = '/'.join(map(str, result_key(result)))
+        # Для всех метрик меньше - лучше
+        for metric in ('encode_s', 'decode_s', 'bytes', 'encode_peak_bytes', 'decode_peak_bytes'):
+            if result[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {old[metric]:.6g} -> {result[metric]:.6g}")
+    return regressions
+
+
+def print_header() -> None:
+    print(f"{'граф':<10}{'людей':>9}{'кодек':>12}{'код, мс':>11}{'декод, мс':>11}"
+          f"{'байт':>12}{'пик код':>12}{'пик декод':>12}")
+
+
+def print_row(r: Dict[str, Any]) -> None:
+    print(f"{r['graph']:<10}{r['size']:>9}{r['codec']:>12}{r['encode_s'] * 1000:>11.2f}"
+          f"{r['decode_s'] * 1000:>11.2f}{r['bytes']:>12}{r['encode_peak_bytes']:>12}"
+          f"{r['decode_peak_bytes']:>12}")
+    for stage, spots in r.get('hotspots', {}).items():
+        print(f"  [{stage}] cProfile:")
+        for line in spots['cpu']:
+            print(f"    {line}")
+        print(f"  [{stage}] tracemalloc:")
+        for line in spots['memory']:
+            print(f"    {line}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализаторов Lab_3")
+    parser.add_argument('--graphs', nargs='+', choices=GRAPHS, default=list(GRAPHS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES),
+                        help="числа людей (например 100 1000 1000000)")
+    parser.add_argument('--codecs', nargs='+', choices=CODECS, default=list(CODECS))
+    parser.add_argument('--profile', choices=(READABLE, FAST), default=READABLE,
+                        help="профиль кодирования")
+    parser.add_argument('--degree', type=int, default=6, help="средняя степень random/powerlaw")
+    parser.add_argument('--clique', type=int, default=10, help="размер клики")
+    parser.add_argument('--repeat', type=int, default=3, help="число замеров")
+    parser.add_argument('--hotspots', type=int, default=0, metavar='N',
+                        help="показать N самых дорогих функций и строк")
+    parser.add_argument('--output', help="куда сохранить результаты (JSON)")
+    parser.add_argument('--baseline', help="эталонный JSON для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="допустимое ухудшение (доля, по умолчанию 0.10)")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора")
+    args = parser.parse_args(argv)
+
+    print_header()
+    results = run_benchmarks(args.graphs, args.sizes, args.codecs, args.profile, args.repeat,
+                             args.seed, args.degree, args.clique, args.hotspots)
+
+    if args.output:
+        report = {
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'seed': args.seed,
+                'degree': args.degree,
+                'clique': args.clique,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nРезультаты сохранены в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nРегрессии (порог {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
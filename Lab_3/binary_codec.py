@@ -0,0 +1,254 @@
+"""
+Компактный двоичный формат графа Person
+UUID заменяются плотными целыми индексами, даты хранятся как целые числа
+от эпохи, имена - в общей таблице строк, списки друзей - разностями
+индексов в varint-кодировке.
+
+Структура:
+    b'PGB1', флаги (1 байт), число людей, таблица строк,
+    идентификаторы (16 байт на UUID или индекс в таблице строк),
+    затем для каждого человека: индекс имени, дата, число друзей, разности.
+Даты с часовым поясом целым числом не представить: если такие есть,
+ставится FLAG_TAGGED_DATES, и дата пишется с битом-меткой: 2*zigzag(мкс)
+для наивной даты или 2*индекс+1 для ISO-строки в таблице строк.
+"""
+import datetime as dt
+import re
+from typing import Dict, List, Tuple
+
+from OOp import Person, PersonSerializer
+from epoch import to_epoch_us, from_epoch_us
+from traversal import traverse, DFS
+
+MAGIC = b'PGB1'
+FLAG_UUID_IDS = 1  # все id - канонические UUID, храним их по 16 байт
+FLAG_TAGGED_DATES = 2  # есть даты с часовым поясом, даты помечены битом
+
+# Ровно такой вид дает str(uuid.UUID(...)), поэтому круг без потерь
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z')
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Беззнаковое целое в формате LEB128"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def zigzag(value: int) -> int:
+    """Знаковое целое -> беззнаковое (маленькие по модулю -> короткие)"""
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def unzigzag(value: int) -> int:
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def write_varints(out: bytearray, values: List[int]) -> None:
+    """Пишет много беззнаковых чисел одним циклом"""
+    append = out.append
+    for value in values:
+        while value > 0x7F:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Читает одно число, возвращает (значение, новая позиция)"""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Неожиданный конец данных")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def read_varints(data: bytes, pos: int) -> List[int]:
+    """Читает все числа от pos до конца буфера одним циклом"""
+    values = []
+    append = values.append
+    result = 0
+    shift = 0
+    for byte in data[pos:]:
+        if byte < 0x80:
+            append(result | (byte << shift))
+            result = 0
+            shift = 0
+        else:
+            result |= (byte & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise ValueError("Неожиданный конец данных")
+    return values
+
+
+def _take(data: bytes, pos: int, size: int) -> bytes:
+    chunk = data[pos:pos + size]
+    if len(chunk) != size:
+        raise ValueError("Неожиданный конец данных")
+    return chunk
+
+
+class BinaryPersonSerializer:
+    """Двоичная сериализация графа Person (совместима по данным с JSON)"""
+
+    @staticmethod
+    def encode(person: Person, order: str = DFS) -> bytes:
+        """Кодирует граф в двоичный формат; корень получает индекс 0"""
+        people: List[Person] = list(
+            traverse(person, lambda p: p._id, Person.friends_view, order))
+        # Через геттеры: SlottedPerson хранит id и дату в упакованном виде
+        index: Dict[Person, int] = {p: i for i, p in enumerate(people)}
+        ids = [p.get_id() for p in people]
+        names = [p.get_name() for p in people]
+        dates = [p.get_birth_date() for p in people]
+        uuid_ids = all(_UUID_RE.match(person_id) for person_id in ids)
+        tagged_dates = any(born_in.tzinfo is not None for born_in in dates)
+
+        # Таблица строк: имена (и id, если это не UUID), без повторов
+        strings: Dict[str, int] = {}
+        for person_id, name, born_in in zip(ids, names, dates):
+            strings.setdefault(name, len(strings))
+            if not uuid_ids:
+                strings.setdefault(person_id, len(strings))
+            if born_in.tzinfo is not None:
+                strings.setdefault(born_in.isoformat(), len(strings))
+
+        out = bytearray(MAGIC)
+        out.append((FLAG_UUID_IDS if uuid_ids else 0) | (FLAG_TAGGED_DATES if tagged_dates else 0))
+        write_varint(out, len(people))
+        write_varint(out, len(strings))
+        for text in strings:
+            raw = text.encode('utf-8')
+            write_varint(out, len(raw))
+            out += raw
+
+        if uuid_ids:
+            out += bytes.fromhex(''.join(ids).replace('-', ''))
+        else:
+            write_varints(out, [strings[person_id] for person_id in ids])
+
+        # Записи людей: имя, дата, число друзей, разности индексов друзей
+        values: List[int] = []
+        append = values.append
+        for i, (p, name, born_in) in enumerate(zip(people, names, dates)):
+            append(strings[name])
+            if not tagged_dates:
+                append(zigzag(to_epoch_us(born_in)))
+            elif born_in.tzinfo is None:
+                append(zigzag(to_epoch_us(born_in)) << 1)
+            else:
+                append(strings[born_in.isoformat()] << 1 | 1)
+            append(len(p._friends))
+            previous = i
+            for friend in p.friends_view():
+                current = index[friend]
+                append(zigzag(current - previous))
+                previous = current
+        write_varints(out, values)
+        return bytes(out)
+
+    @staticmethod
+    def decode(data: bytes) -> Person:
+        """Восстанавливает граф из двоичного формата, возвращает корень"""
+        if data[:4] != MAGIC:
+            raise ValueError("Это не двоичный граф Person (неверная сигнатура)")
+        flags = _take(data, 4, 1)[0]
+        count, pos = read_varint(data, 5)
+        if count == 0:
+            raise ValueError("Граф не содержит ни одного человека")
+
+        string_count, pos = read_varint(data, pos)
+        strings: List[str] = []
+        for _ in range(string_count):
+            size, pos = read_varint(data, pos)
+            strings.append(_take(data, pos, size).decode('utf-8'))
+            pos += size
+
+        if flags & FLAG_UUID_IDS:
+            hex_ids = _take(data, pos, 16 * count).hex()
+            pos += 16 * count
+            ids = [f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+                   for h in (hex_ids[k:k + 32] for k in range(0, 32 * count, 32))]
+            values = read_varints(data, pos)
+            cursor = 0
+        else:
+            values = read_varints(data, pos)
+            ids = [strings[k] for k in values[:count]]
+            cursor = count
+
+        people: List[Person] = []
+        for person_id in ids:
+            obj = Person.__new__(Person)
+            obj._id = person_id
+            people.append(obj)
+
+        tagged_dates = flags & FLAG_TAGGED_DATES
+        try:
+            for i, obj in enumerate(people):
+                obj._name = strings[values[cursor]]
+                born_in = values[cursor + 1]
+                if not tagged_dates:
+                    obj._born_in = from_epoch_us(unzigzag(born_in))
+                elif born_in & 1:
+                    obj._born_in = dt.datetime.fromisoformat(strings[born_in >> 1])
+                else:
+                    obj._born_in = from_epoch_us(unzigzag(born_in >> 1))
+                degree = values[cursor + 2]
+                cursor += 3
+                friends: Dict[Person, None] = {}
+                previous = i
+                for delta in values[cursor:cursor + degree]:
+                    previous += (delta >> 1) if not delta & 1 else -((delta + 1) >> 1)
+                    # Отрицательный индекс не даст IndexError, а молча возьмет человека с конца
+                    if not 0 <= previous < count:
+                        raise ValueError("Поврежденные данные графа")
+                    friends[people[previous]] = None
+                cursor += degree
+                obj._friends = friends
+        except IndexError:
+            raise ValueError("Поврежденные данные графа") from None
+        return people[0]
+
+
+# === Сравнение с JSON ===
+if __name__ == "__main__":
+    import random
+    import sys
+    import time
+
+    from graph_generators import random_graph, build_objects
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(42)
+    names = ["Ivan", "Petr", "Anna", "Maria", "Olga", "Sergey", "Nikolay", "Elena"]
+    # Имена повторяются - так таблица строк работает как на реальных данных
+    records = [(rng.choice(names), dt.datetime(1970, 1, 1) + dt.timedelta(days=rng.randint(0, 20000)))
+               for _ in range(size)]
+    people = build_objects(Person, records, random_graph(size, rng, degree=4))
+
+    def timed(func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    json_data, json_enc = timed(PersonSerializer.encode, people[0])
+    json_root, json_dec = timed(PersonSerializer.decode, json_data)
+    bin_data, bin_enc = timed(BinaryPersonSerializer.encode, people[0])
+    bin_root, bin_dec = timed(BinaryPersonSerializer.decode, bin_data)
+
+    # Данные после двоичного круга совпадают с JSON-версией
+    assert PersonSerializer.encode(bin_root) == json_data
+
+    print(f"=== Двоичный формат, {size} человек ===")
+    print(f"{'формат':<10}{'байт':>12}{'кодирование, с':>18}{'декодирование, с':>20}")
+    print(f"{'JSON':<10}{len(json_data):>12}{json_enc:>18.3f}{json_dec:>20.3f}")
+    print(f"{'binary':<10}{len(bin_data):>12}{bin_enc:>18.3f}{bin_dec:>20.3f}")
+    print(f"Размер меньше в {len(json_data) / len(bin_data):.1f} раз")
@@ -3,65 +3,70 @@
 Использует только публичный интерфейс объектов
 """
 import json
+import sys
 import datetime as dt
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Iterable, KeysView, Optional, Set, Tuple
+
+import profiles
+from epoch import pack_date, unpack_date
+from stream_io import ChunkedWriter, iter_records, write_record, DEFAULT_CHUNK_SIZE
+from profiles import READABLE, FAST
+from traversal import traverse, DFS
 
 # Определяем типы для работы с Person
 PersonLike = Any  # Любой объект с определенным интерфейсом
 
 
-def encode_functional_encapsulated(person: PersonLike) -> bytes:
-    """
-    Функциональный стиль с соблюдением инкапсуляции.
-    Работает только через публичные методы объекта.
-    """
-
-    def get_id(p: PersonLike) -> str:
-        """Получает ID объекта через его метод"""
-        if hasattr(p, 'get_id'):
-            return p.get_id()
-        # Если нет метода get_id, создаем на основе хэша
-        return str(hash(p))
-
-    def get_name(p: PersonLike) -> str:
-        """Получает имя через публичный метод"""
-        return p.get_name()
+def _get_id(p: PersonLike) -> str:
+    """Получает ID объекта через его метод"""
+    if hasattr(p, 'get_id'):
+        return p.get_id()
+    # Если нет метода get_id, создаем на основе хэша
+    return str(hash(p))
 
-    def get_birth_date(p: PersonLike) -> dt.datetime:
-        """Получает дату рождения через публичный метод"""
-        return p.get_birth_date()
 
-    def get_friends(p: PersonLike) -> List[PersonLike]:
-        """Получает друзей через публичный метод"""
-        return p.get_friends()
+def _get_friends(p: PersonLike) -> Iterable[PersonLike]:
+    """
+    Получает друзей через публичный метод.
+    Если объект умеет отдавать представление без копии, используем его.
+    """
+    if hasattr(p, 'friends_view'):
+        return p.friends_view()
+    return p.get_friends()
 
-    # Основная логика кодирования
-    all_objects_data: List[Dict[str, Any]] = []
-    visited_ids: set = set()
 
-    def process_person(p: PersonLike):
-        """Рекурсивно обрабатывает персону и ее друзей"""
-        current_id = get_id(p)
+def _to_dict(p: PersonLike) -> Dict[str, Any]:
+    """Собирает данные человека через публичные методы"""
+    return {
+        'id': _get_id(p),
+        'name': p.get_name(),
+        'born_in': p.get_birth_date().isoformat(),
+        'friends': [_get_id(friend) for friend in _get_friends(p)]
+    }
 
-        if current_id in visited_ids:
-            return
 
-        visited_ids.add(current_id)
+def encode_functional_encapsulated(person: PersonLike, order: str = DFS,
+                                   profile: str = READABLE) -> bytes:
+    """
+    Функциональный стиль с соблюдением инкапсуляции.
+    Работает только через публичные методы объекта.
+    order задает порядок обхода графа: DFS (по умолчанию) или BFS.
+    profile=FAST - компактный JSON с датами-числами (см. profiles).
+    """
+    profiles.check_profile(profile)
 
-        # Собираем данные через публичные методы
-        obj_data = {
-            'id': current_id,
-            'name': get_name(p),
-            'born_in': get_birth_date(p).isoformat(),
-            'friends': [get_id(friend) for friend in get_friends(p)]
-        }
-        all_objects_data.append(obj_data)
+    if profile == FAST:
+        return profiles.dump_fast([
+            [_get_id(p), p.get_name(), profiles.encode_date(p.get_birth_date()),
+             [_get_id(friend) for friend in _get_friends(p)]]
+            for p in traverse(person, _get_id, _get_friends, order)
+        ])
 
-        # Рекурсивно обрабатываем друзей
-        for friend in get_friends(p):
-            process_person(friend)
+    # Основная логика кодирования: обход без рекурсии
+    all_objects_data: List[Dict[str, Any]] = [
+        _to_dict(p) for p in traverse(person, _get_id, _get_friends, order)
+    ]
 
-    process_person(person)
     return json.dumps(all_objects_data, indent=2).encode('utf-8')
 
 
@@ -72,31 +77,86 @@ def decode_functional_encapsulated(
     """
     Декодирует данные в объекты, используя фабрику.
     Восстанавливает связи через публичные методы.
+    Профиль (читаемый или быстрый) определяется по данным.
     """
-    objects_data = json.loads(data.decode('utf-8'))
+    objects_data, fast = profiles.load(data)
+    if fast:
+        records = profiles.fast_records(objects_data)
+    else:
+        records = [(obj_data['id'], obj_data['name'],
+                    dt.datetime.fromisoformat(obj_data['born_in']), obj_data['friends'])
+                   for obj_data in objects_data]
+
+    return _build_graph(records, person_factory)
+
 
-    # Создаем временные объекты
-    temp_objects: Dict[str, Dict[str, Any]] = {}
+def _build_graph(records: Iterable[Tuple[str, str, dt.datetime, List[str]]],
+                 person_factory: Callable[[str, dt.datetime], PersonLike]) -> PersonLike:
+    """Создает объекты фабрикой и связывает их; возвращает первого"""
+    # Создаем временные объекты: id -> объект и id -> id друзей
+    objects: Dict[str, PersonLike] = {}
+    friend_ids_of: Dict[str, List[str]] = {}
 
     # Фаза 1: Создаем объекты без связей
-    for obj_data in objects_data:
-        temp_objects[obj_data['id']] = {
-            'obj': person_factory(obj_data['name'],
-                                  dt.datetime.fromisoformat(obj_data['born_in'])),
-            'friend_ids': obj_data['friends']
-        }
+    for obj_id, name, born_in, friend_ids in records:
+        objects[obj_id] = person_factory(name, born_in)
+        friend_ids_of[obj_id] = friend_ids
 
     # Фаза 2: Восстанавливаем связи
-    # Для этого нужны методы add_friend у объектов
-    for obj_id, data in temp_objects.items():
-        person_obj = data['obj']
-        for friend_id in data['friend_ids']:
-            friend_obj = temp_objects[friend_id]['obj']
-            person_obj.add_friend(friend_obj)
+    # Связь обычно записана с обеих сторон, а связывание симметрично,
+    # поэтому каждую пару (без учета порядка) применяем один раз - у того,
+    # кто записал ее первым. Связь, записанная только с одной стороны,
+    # тоже восстанавливается с обеих.
+    #   add_friends_bulk(friends) - симметричен и пропускает уже связанных:
+    #       примененные пары помнят сами словари друзей, передаем всех;
+    #   add_friend(friend) - проверка "уже друг" может быть линейной,
+    #       поэтому примененные пары помним сами: id -> id уже примененных друзей.
+    applied: Dict[str, Set[str]] = {}
+    lookup = objects.__getitem__
+    for obj_id, person_obj in objects.items():
+        friend_ids = friend_ids_of[obj_id]
+        add_friends_bulk = getattr(person_obj, 'add_friends_bulk', None)
+        if add_friends_bulk is not None:
+            add_friends_bulk(map(lookup, friend_ids))
+            continue
+        for friend_id in friend_ids:
+            if obj_id not in applied.get(friend_id, ()):
+                person_obj.add_friend(objects[friend_id])
+        applied[obj_id] = set(friend_ids)
+
+    if not objects:
+        raise ValueError("Граф не содержит ни одного человека")
 
     # Возвращаем первый объект
-    first_id = objects_data[0]['id']
-    return temp_objects[first_id]['obj']
+    return next(iter(objects.values()))
+
+
+def dump_functional_encapsulated(person: PersonLike, fileobj: Any,
+                                 compression: Optional[str] = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                 order: str = DFS) -> int:
+    """
+    Пишет граф в файл/сокет кусками, по записи на человека,
+    по желанию со сжатием ('zlib', 'lzma', 'bz2'). Возвращает число людей.
+    """
+    count = 0
+    with ChunkedWriter(fileobj, compression, chunk_size) as writer:
+        for p in traverse(person, _get_id, _get_friends, order):
+            write_record(writer, _to_dict(p))
+            count += 1
+    return count
+
+
+def load_functional_encapsulated(
+        fileobj: Any,
+        person_factory: Callable[[str, dt.datetime], PersonLike],
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> PersonLike:
+    """Читает граф, записанный dump_functional_encapsulated; сжатие определяется само"""
+    records = ((obj_data['id'], obj_data['name'],
+                dt.datetime.fromisoformat(obj_data['born_in']), obj_data['friends'])
+               for obj_data in iter_records(fileobj, chunk_size))
+    return _build_graph(records, person_factory)
 
 
 # === Вспомогательный класс для демонстрации ===
@@ -106,7 +166,7 @@ class FunctionalPerson:
     def __init__(self, name: str, born_in: dt.datetime):
         self._name = name
         self._born_in = born_in
-        self._friends: List['FunctionalPerson'] = []
+        self._friends: Dict['FunctionalPerson', None] = {}
         self._id = f"person_{hash((name, born_in))}"
 
     def get_id(self) -> str:
@@ -119,12 +179,66 @@ class FunctionalPerson:
         return self._born_in
 
     def get_friends(self) -> List['FunctionalPerson']:
-        return self._friends.copy()
+        return list(self._friends)
+
+    def friends_view(self) -> KeysView['FunctionalPerson']:
+        return self._friends.keys()
 
     def add_friend(self, friend: 'FunctionalPerson'):
         if friend not in self._friends:
-            self._friends.append(friend)
-            friend._friends.append(self)
+            self._friends[friend] = None
+            friend._friends[self] = None
+
+    def add_friends_bulk(self, friends: Iterable['FunctionalPerson']):
+        """Добавляет взаимную дружбу со всеми из friends"""
+        own = self._friends
+        for friend in friends:
+            if friend not in own:
+                own[friend] = None
+                friend._friends[self] = None
+
+
+class SlottedFunctionalPerson:
+    """
+    Экономная по памяти версия FunctionalPerson: __slots__, id хранится
+    числом (хэшем), имя интернируется, дата - целым числом.
+    """
+
+    __slots__ = ('_name', '_born_in', '_friends', '_id')
+
+    def __init__(self, name: str, born_in: dt.datetime):
+        self._name = sys.intern(name)
+        self._born_in = pack_date(born_in)
+        self._friends: Dict['SlottedFunctionalPerson', None] = {}
+        self._id = hash((name, born_in))
+
+    def get_id(self) -> str:
+        return f"person_{self._id}"
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_birth_date(self) -> dt.datetime:
+        return unpack_date(self._born_in)
+
+    def get_friends(self) -> List['SlottedFunctionalPerson']:
+        return list(self._friends)
+
+    def friends_view(self) -> KeysView['SlottedFunctionalPerson']:
+        return self._friends.keys()
+
+    def add_friend(self, friend: 'SlottedFunctionalPerson'):
+        if friend not in self._friends:
+            self._friends[friend] = None
+            friend._friends[self] = None
+
+    def add_friends_bulk(self, friends: Iterable['SlottedFunctionalPerson']):
+        """Добавляет взаимную дружбу со всеми из friends"""
+        own = self._friends
+        for friend in friends:
+            if friend not in own:
+                own[friend] = None
+                friend._friends[self] = None
 
 
 # === Пример использования ===
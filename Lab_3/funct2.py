@@ -4,9 +4,15 @@
 """
 import json
 import datetime as dt
-from typing import Dict, List, Any, Tuple
+from array import array
+from typing import Dict, List, Any, Tuple, Optional, Iterable
 import uuid
 
+import profiles
+from profiles import READABLE, FAST
+from sharding import encode_shards, decode_shards
+from stream_io import ChunkedWriter, iter_records, write_record, DEFAULT_CHUNK_SIZE
+
 
 def create_person_dict(name: str, born_in: dt.datetime) -> Dict[str, Any]:
     """Создает словарь с данными о человеке (не объект!)"""
@@ -31,11 +37,20 @@ def add_friend_dict(person1: Dict[str, Any], person2: Dict[str, Any],
 
 
 def encode_pure_functional(persons_list: List[Dict[str, Any]],
-                           root_index: int = 0) -> bytes:
+                           root_index: int = 0, profile: str = READABLE) -> bytes:
     """
     Чисто функциональная сериализация.
     Работает только со структурами данных.
+    profile=FAST - компактный JSON с датами-числами (см. profiles).
     """
+    profiles.check_profile(profile)
+    if profile == FAST:
+        return profiles.dump_fast(
+            [[person['id'], person['name'], profiles.encode_date(person['born_in']),
+              [persons_list[friend_idx]['id'] for friend_idx in person['friends']]]
+             for person in persons_list],
+            root_id=persons_list[root_index]['id'])
+
     # Конвертируем даты в строки
     serializable_list = []
     for person in persons_list:
@@ -60,9 +75,23 @@ def decode_pure_functional(data: bytes) -> Tuple[List[Dict[str, Any]], Dict[str,
     """
     Чисто функциональная десериализация.
     Возвращает список всех людей и корневого человека.
+    Профиль (читаемый или быстрый) определяется по данным.
     """
-    parsed = json.loads(data.decode('utf-8'))
+    parsed, fast = profiles.load(data)
     root_id = parsed['root_id']
+    if fast:
+        records = profiles.fast_records(parsed)
+        id_to_index = {record[0]: i for i, record in enumerate(records)}
+        persons_list = [
+            {
+                'name': name,
+                'born_in': born_in,
+                'friends': [id_to_index[friend_id] for friend_id in friend_ids],
+                'id': person_id
+            }
+            for person_id, name, born_in, friend_ids in records
+        ]
+        return persons_list, persons_list[id_to_index[root_id]]
 
     # Восстанавливаем структуры данных
     persons_list = []
@@ -91,6 +120,256 @@ def decode_pure_functional(data: bytes) -> Tuple[List[Dict[str, Any]], Dict[str,
     return persons_list, root_person
 
 
+def dump_pure_functional(persons_list: List[Dict[str, Any]], fileobj: Any,
+                         root_index: int = 0, compression: Optional[str] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Пишет людей в файл/сокет кусками: первая строка - root_id,
+    дальше по записи на человека; по желанию со сжатием.
+    Возвращает число людей.
+    """
+    with ChunkedWriter(fileobj, compression, chunk_size) as writer:
+        write_record(writer, {'root_id': persons_list[root_index]['id']})
+        for person in persons_list:
+            write_record(writer, {
+                'name': person['name'],
+                'born_in': person['born_in'].isoformat(),
+                'friends': [persons_list[friend_idx]['id'] for friend_idx in person['friends']],
+                'id': person['id']
+            })
+    return len(persons_list)
+
+
+def load_pure_functional(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE
+                         ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Читает людей, записанных dump_pure_functional; сжатие определяется само"""
+    records = iter_records(fileobj, chunk_size)
+    header = next(records, None)
+    if header is None or 'root_id' not in header:
+        raise ValueError("Поток не начинается с заголовка root_id")
+
+    persons_list = []
+    id_to_index: Dict[str, int] = {}
+    for i, person_data in enumerate(records):
+        person_data['born_in'] = dt.datetime.fromisoformat(person_data['born_in'])
+        persons_list.append(person_data)
+        id_to_index[person_data['id']] = i
+
+    # id друзей -> индексы
+    for person in persons_list:
+        person['friends'] = [id_to_index[friend_id] for friend_id in person['friends']]
+    return persons_list, persons_list[id_to_index[header['root_id']]]
+
+
+def encode_pure_functional_sharded(persons_list: List[Dict[str, Any]],
+                                   root_index: int = 0, shards: int = 4,
+                                   processes: Optional[int] = None) -> bytes:
+    """
+    Шардированная сериализация: список делится на shards диапазонов,
+    записи шардов строятся и кодируются в пуле процессов.
+    """
+    def to_record(person: Dict[str, Any]) -> Tuple[str, str, dt.datetime, List[str]]:
+        return (person['id'], person['name'], person['born_in'],
+                [persons_list[friend_idx]['id'] for friend_idx in person['friends']])
+
+    return encode_shards(persons_list, to_record, persons_list[root_index]['id'], shards, processes)
+
+
+def decode_pure_functional_sharded(data: bytes, processes: Optional[int] = None
+                                   ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Шардированная десериализация: шарды разбираются параллельно,
+    индексы друзей восстанавливаются на общем этапе слияния.
+    """
+    root_id, records = decode_shards(data, processes)
+    id_to_index = {record[0]: i for i, record in enumerate(records)}
+    persons_list = [
+        {
+            'name': name,
+            'born_in': born_in,
+            'friends': [id_to_index[friend_id] for friend_id in friend_ids],
+            'id': person_id
+        }
+        for person_id, name, born_in, friend_ids in records
+    ]
+    return persons_list, persons_list[id_to_index[root_id]]
+
+
+# === Колоночное хранилище с CSR-смежностью ===
+# Вместо списка словарей - параллельные массивы (id, имена, даты),
+# друзья в формате CSR: друзья человека i лежат в
+# neighbours[offsets[i]:offsets[i + 1]]. Связи добавляются пачкой
+# и применяются одним шагом store_finalise за O(V + E).
+
+def create_person_store() -> Dict[str, Any]:
+    """Создает пустое колоночное хранилище людей"""
+    return {
+        'ids': [],
+        'names': [],
+        'born_in': [],
+        'id_index': {},              # id -> индекс
+        'name_index': {},            # имя -> список индексов
+        'offsets': array('q', [0]),  # CSR: начало списка друзей каждого человека
+        'neighbours': array('q'),    # CSR: индексы друзей подряд
+        'pending': array('q'),       # добавленные, но не примененные пары (плоско)
+    }
+
+
+def store_add_person(store: Dict[str, Any], name: str, born_in: dt.datetime,
+                     person_id: Optional[str] = None) -> int:
+    """Добавляет человека, возвращает его индекс"""
+    if person_id is None:
+        person_id = str(uuid.uuid4())
+    if person_id in store['id_index']:
+        raise ValueError(f"Человек с id {person_id} уже есть в хранилище")
+    index = len(store['ids'])
+    store['ids'].append(person_id)
+    store['names'].append(name)
+    store['born_in'].append(born_in)
+    store['id_index'][person_id] = index
+    store['name_index'].setdefault(name, []).append(index)
+    # У нового человека пока нет друзей
+    store['offsets'].append(store['offsets'][-1])
+    return index
+
+
+def store_add_friends(store: Dict[str, Any], pairs: Iterable[Tuple[int, int]]) -> None:
+    """
+    Запоминает пачку взаимных дружб (пары индексов).
+    Списки друзей обновятся после store_finalise.
+    """
+    pending = store['pending']
+    for a, b in pairs:
+        pending.append(a)
+        pending.append(b)
+
+
+def store_finalise(store: Dict[str, Any]) -> None:
+    """
+    Применяет отложенные дружбы: одна сортировка подсчетом по всем
+    связям, повторы убираются, порядок добавления сохраняется.
+    """
+    pending = store['pending']
+    if not pending:
+        return
+    count = len(store['ids'])
+    offsets, neighbours = store['offsets'], store['neighbours']
+
+    # Направленные связи: сначала существующие, затем новые в обе стороны
+    sources = array('q')
+    for i in range(count):
+        sources.extend([i] * (offsets[i + 1] - offsets[i]))
+    targets = array('q', neighbours)
+    for k in range(0, len(pending), 2):
+        a, b = pending[k], pending[k + 1]
+        if not (0 <= a < count and 0 <= b < count):
+            raise ValueError(f"Нет человека с индексом {a if not 0 <= a < count else b}")
+        sources.append(a)
+        targets.append(b)
+        if a != b:
+            sources.append(b)
+            targets.append(a)
+
+    # Сортировка подсчетом по источнику (устойчивая)
+    degree = [0] * count
+    for source in sources:
+        degree[source] += 1
+    starts = [0] * count
+    total = 0
+    for i in range(count):
+        starts[i] = total
+        total += degree[i]
+    ordered = array('q', bytes(8 * total))
+    for source, target in zip(sources, targets):
+        ordered[starts[source]] = target
+        starts[source] += 1
+
+    # Убираем повторы внутри каждого списка
+    new_offsets = array('q', [0])
+    new_neighbours = array('q')
+    start = 0
+    for i in range(count):
+        end = start + degree[i]
+        new_neighbours.extend(dict.fromkeys(ordered[start:end]))
+        new_offsets.append(len(new_neighbours))
+        start = end
+
+    store['offsets'] = new_offsets
+    store['neighbours'] = new_neighbours
+    store['pending'] = array('q')
+
+
+def store_friends(store: Dict[str, Any], index: int) -> array:
+    """Индексы друзей человека (после store_finalise)"""
+    offsets = store['offsets']
+    return store['neighbours'][offsets[index]:offsets[index + 1]]
+
+
+def store_find_by_name(store: Dict[str, Any], name: str) -> Optional[int]:
+    """Индекс первого человека с таким именем за O(1), None если нет"""
+    indices = store['name_index'].get(name)
+    return indices[0] if indices else None
+
+
+def encode_store(store: Dict[str, Any], root_index: int = 0, profile: str = READABLE) -> bytes:
+    """
+    Сериализует хранилище в тот же формат, что encode_pure_functional,
+    поэтому результат читается и decode_pure_functional, и decode_store.
+    """
+    profiles.check_profile(profile)
+    if store['pending']:
+        raise ValueError("Есть непримененные дружбы, сначала вызовите store_finalise")
+    ids, offsets, neighbours = store['ids'], store['offsets'], store['neighbours']
+    if profile == FAST:
+        return profiles.dump_fast(
+            [[ids[i], name, profiles.encode_date(born_in),
+              [ids[j] for j in neighbours[offsets[i]:offsets[i + 1]]]]
+             for i, (name, born_in) in enumerate(zip(store['names'], store['born_in']))],
+            root_id=ids[root_index])
+    serializable_list = [
+        {
+            'name': name,
+            'born_in': born_in.isoformat(),
+            'friends': [ids[j] for j in neighbours[offsets[i]:offsets[i + 1]]],
+            'id': ids[i]
+        }
+        for i, (name, born_in) in enumerate(zip(store['names'], store['born_in']))
+    ]
+    result = {
+        'root_id': ids[root_index],
+        'persons': serializable_list
+    }
+    return json.dumps(result, indent=2).encode('utf-8')
+
+
+def decode_store(data: bytes) -> Tuple[Dict[str, Any], int]:
+    """
+    Десериализует прямо в колоночное хранилище, возвращает его и индекс корня.
+    Профиль (читаемый или быстрый) определяется по данным.
+    """
+    parsed, fast = profiles.load(data)
+    if fast:
+        records = profiles.fast_records(parsed)
+    else:
+        records = [(person_data['id'], person_data['name'],
+                    dt.datetime.fromisoformat(person_data['born_in']), person_data['friends'])
+                   for person_data in parsed['persons']]
+
+    store = create_person_store()
+    for person_id, name, born_in, _ in records:
+        store_add_person(store, name, born_in, person_id)
+
+    # Списки друзей уже взаимные и без повторов - сразу в CSR
+    id_index = store['id_index']
+    offsets, neighbours = array('q', [0]), array('q')
+    for _, _, _, friend_ids in records:
+        neighbours.extend(id_index[friend_id] for friend_id in friend_ids)
+        offsets.append(len(neighbours))
+    store['offsets'] = offsets
+    store['neighbours'] = neighbours
+    return store, id_index[parsed['root_id']]
+
+
 def find_person_by_name(persons_list: List[Dict[str, Any]], name: str) -> Dict[str, Any]:
     """Находит человека по имени (функциональный стиль)"""
     return next(p for p in persons_list if p['name'] == name)
@@ -140,3 +419,14 @@ if __name__ == "__main__":
     anna = find_person_by_name(decoded_list2, "Anna")
     print(f"У Анны друзей: {len(anna['friends'])}")
     print(f"Первый друг Анны: {decoded_list2[anna['friends'][0]]['name']}")
+
+    # Колоночное хранилище: связи добавляются пачкой, индексы без поиска
+    store = create_person_store()
+    for person in persons:
+        store_add_person(store, person['name'], person['born_in'], person['id'])
+    store_add_friends(store, [(0, 1), (1, 2), (2, 0)])
+    store_finalise(store)
+
+    store2, root_index = decode_store(encode_store(store, 0))
+    anna_index = store_find_by_name(store2, "Anna")
+    print(f"\nКолоночное хранилище: у Анны друзей: {len(store_friends(store2, anna_index))}")
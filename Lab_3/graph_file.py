@@ -0,0 +1,235 @@
+"""
+Индексированный файл графа Person
+Записи людей лежат в файле по одной компактной JSON-строке, в конце файла -
+отсортированный индекс "хэш id -> смещение". Файл открывается через mmap,
+поэтому для одного человека читается и разбирается только его запись
+(и, по запросу, записи соседей на k шагов).
+
+Структура:
+    b'PGF1\\n'
+    записи (JSON-строки, первая - корень)
+    индекс: n записей по 20 байт (хэш id, смещение, длина), по возрастанию хэша
+    хвост: смещение индекса, n, b'PGFI'
+"""
+import datetime as dt
+import hashlib
+import json
+import mmap
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from OOp import Person, LazyGraph, LazyPerson
+from traversal import traverse, DFS
+
+MAGIC = b'PGF1\n'
+TRAILER_MAGIC = b'PGFI'
+_ENTRY = struct.Struct('<QQI')    # хэш id, смещение записи, длина записи
+_TRAILER = struct.Struct('<QQ4s')  # смещение индекса, число записей, сигнатура
+
+
+def _id_key(person_id: str) -> int:
+    """64-битный хэш id (стабильный между запусками, в отличие от hash())"""
+    return int.from_bytes(hashlib.blake2b(person_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class GraphFile:
+    """Граф Person на диске с доступом к отдельному человеку по id"""
+
+    @staticmethod
+    def write(person: Person, fp: BinaryIO, order: str = DFS) -> int:
+        """
+        Записывает граф в открытый двоичный файл.
+        Записи пишутся по ходу обхода, в памяти держится только индекс.
+        fp должен стоять в начале файла: смещения в индексе отсчитываются
+        от начала, и GraphFile ищет сигнатуру там же.
+        Возвращает число записанных людей.
+        """
+        if fp.seekable() and fp.tell() != 0:
+            raise ValueError("Файл графа пишется с начала файла (позиция 0)")
+        fp.write(MAGIC)
+        offset = len(MAGIC)
+        entries: List[Tuple[int, int, int]] = []
+        for p in traverse(person, lambda p: p._id, Person.friends_view, order):
+            record = p.to_serializable_dict()
+            line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+            fp.write(line)
+            entries.append((_id_key(record['id']), offset, len(line)))
+            offset += len(line)
+
+        entries.sort()
+        for entry in entries:
+            fp.write(_ENTRY.pack(*entry))
+        fp.write(_TRAILER.pack(offset, len(entries), TRAILER_MAGIC))
+        return len(entries)
+
+    @classmethod
+    def save(cls, person: Person, path: str, order: str = DFS) -> int:
+        """Записывает граф в файл по пути"""
+        with open(path, 'wb') as fp:
+            return cls.write(person, fp, order)
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Пустой файл: {path}") from None
+
+        size = len(self._map)
+        if size < len(MAGIC) + _TRAILER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Это не файл графа Person: {path}")
+        index_offset, count, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if magic != TRAILER_MAGIC or index_offset + count * _ENTRY.size != size - _TRAILER.size:
+            self.close()
+            raise ValueError(f"Поврежден индекс файла графа: {path}")
+        self._index_offset = index_offset
+        self._count = count
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'GraphFile':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, person_id: str) -> bool:
+        return self._locate(person_id) is not None
+
+    # === Поиск по индексу ===
+
+    def _entry(self, position: int) -> Tuple[int, int, int]:
+        return _ENTRY.unpack_from(self._map, self._index_offset + position * _ENTRY.size)
+
+    def _read_record(self, offset: int, length: int) -> Dict[str, Any]:
+        return json.loads(self._map[offset:offset + length])
+
+    def _locate(self, person_id: str) -> Optional[Dict[str, Any]]:
+        """Двоичный поиск по индексу: O(log n) чтений из mmap"""
+        found = self._locate_offset(person_id)
+        return None if found is None else found[1]
+
+    def _locate_offset(self, person_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        key = _id_key(person_id)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        # Одинаковый хэш у разных id возможен, проверяем сами записи
+        position = low
+        while position < self._count:
+            entry_key, offset, length = self._entry(position)
+            if entry_key != key:
+                break
+            record = self._read_record(offset, length)
+            if record['id'] == person_id:
+                return offset, record
+            position += 1
+        return None
+
+    # === Публичный интерфейс ===
+
+    def root_id(self) -> str:
+        """id корневого человека (первая запись файла)"""
+        end = self._map.find(b'\n', len(MAGIC))
+        return self._read_record(len(MAGIC), end + 1 - len(MAGIC))['id']
+
+    def record(self, person_id: str) -> Dict[str, Any]:
+        """Разобранная запись одного человека (друзья - списком id)"""
+        record = self._locate(person_id)
+        if record is None:
+            raise KeyError(person_id)
+        return record
+
+    def get(self, person_id: str, hops: int = 0) -> Person:
+        """
+        Загружает человека и всех, до кого не больше hops шагов.
+        Связи восстанавливаются только между загруженными людьми:
+        при hops=0 у человека нет друзей, при hops=1 есть друзья,
+        но у друзей видны только общие с ним связи внутри окрестности.
+        """
+        records: Dict[str, Dict[str, Any]] = {person_id: self.record(person_id)}
+        frontier = [person_id]
+        for _ in range(hops):
+            next_frontier = []
+            for current in frontier:
+                for friend_id in records[current]['friends']:
+                    if friend_id not in records:
+                        records[friend_id] = self.record(friend_id)
+                        next_frontier.append(friend_id)
+            frontier = next_frontier
+
+        obj_cache: Dict[str, Person] = {}
+        for data in records.values():
+            Person.from_serializable_dict(data, obj_cache)
+        for friend_id, data in records.items():
+            obj_cache[friend_id]._friends = dict.fromkeys(
+                obj_cache[i] for i in data['friends'] if i in obj_cache)
+        return obj_cache[person_id]
+
+    def get_lazy(self, person_id: str) -> LazyPerson:
+        """
+        Заместитель человека: записи разбираются только при обращении,
+        друзья подгружаются по индексу по мере обхода.
+        Файл должен оставаться открытым, пока граф используется.
+        """
+        return _FileLazyGraph(self).proxy(person_id)
+
+
+class _FileLazyGraph(LazyGraph):
+    """Ленивый источник поверх GraphFile: смещения берутся из индекса"""
+
+    def __init__(self, graph_file: GraphFile) -> None:
+        super().__init__()
+        self._graph_file = graph_file
+
+    def locate(self, person_id: str) -> int:
+        found = self._graph_file._locate_offset(person_id)
+        if found is None:
+            raise KeyError(person_id)
+        return found[0]
+
+    def load(self, offset: int) -> Dict[str, Any]:
+        mapped = self._graph_file._map
+        return self._graph_file._read_record(offset, mapped.find(b'\n', offset) + 1 - offset)
+
+
+# === Пример использования ===
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    ivan = Person("Ivan", dt.datetime(2020, 4, 12))
+    petr = Person("Petr", dt.datetime(2021, 9, 27))
+    anna = Person("Anna", dt.datetime(2019, 3, 15))
+    ivan.add_friend(petr)
+    petr.add_friend(anna)
+
+    path = os.path.join(tempfile.mkdtemp(), 'graph.pgf')
+    GraphFile.save(ivan, path)
+
+    with GraphFile(path) as graph:
+        start = time.perf_counter()
+        loaded = graph.get(anna._id)
+        elapsed = time.perf_counter() - start
+        print("=== Индексированный файл графа ===")
+        print(f"Людей в файле: {len(graph)}, корень: {graph.get(graph.root_id()).get_name()}")
+        print(f"Загружена только {loaded.get_name()} за {elapsed * 1000:.3f} мс")
+
+        nearby = graph.get(petr._id, hops=1)
+        print(f"Окрестность {nearby.get_name()}: {[f.get_name() for f in nearby.get_friends()]}")
+
+        lazy = graph.get_lazy(ivan._id)
+        print(f"Ленивый доступ: {lazy.get_name()} -> {lazy.get_friends()[0].get_friends()[1].get_name()}")
@@ -0,0 +1,78 @@
+"""
+Синтетические графы знакомств для бенчмарков и примеров Lab_3
+Генераторы возвращают список связей (пары индексов людей); все графы
+связные, чтобы обход от корня (человека 0) видел каждого:
+    random    - случайные связи, средняя степень degree
+    powerlaw  - предпочтительное присоединение (Барабаши-Альберт)
+    chain     - длинная цепочка
+    cliques   - клики по clique человек, соединенные в кольцо
+"""
+import datetime as dt
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+Edges = List[Tuple[int, int]]
+
+
+def random_graph(people: int, rng: random.Random, degree: int = 6, **_: Any) -> Edges:
+    # Связь с кем-то из предыдущих гарантирует связность
+    edges = [(i, rng.randrange(i)) for i in range(1, people)]
+    edges += [(rng.randrange(people), rng.randrange(people))
+              for _ in range(max(0, people * degree // 2 - len(edges)))]
+    return edges
+
+
+def powerlaw_graph(people: int, rng: random.Random, degree: int = 6, **_: Any) -> Edges:
+    """Барабаши-Альберт: новый человек дружит с m уже популярными"""
+    m = max(1, degree // 2)
+    edges: Edges = []
+    # Каждая вершина лежит здесь столько раз, какова ее степень
+    targets: List[int] = [0]
+    for i in range(1, people):
+        chosen = {targets[rng.randrange(len(targets))] for _ in range(min(m, i))}
+        for j in chosen:
+            edges.append((i, j))
+            targets.append(j)
+        targets.extend([i] * len(chosen))
+    return edges
+
+
+def chain_graph(people: int, rng: random.Random, **_: Any) -> Edges:
+    return [(i, i + 1) for i in range(people - 1)]
+
+
+def cliques_graph(people: int, rng: random.Random, clique: int = 10, **_: Any) -> Edges:
+    edges = []
+    starts = list(range(0, people, clique))
+    for start in starts:
+        members = range(start, min(start + clique, people))
+        edges += [(a, b) for a in members for b in members if a < b]
+    # Кольцо между кликами
+    edges += [(starts[k], starts[k + 1]) for k in range(len(starts) - 1)]
+    if len(starts) > 2:
+        edges.append((starts[-1], starts[0]))
+    return edges
+
+
+GENERATORS: Dict[str, Callable[..., Edges]] = {
+    'random': random_graph,
+    'powerlaw': powerlaw_graph,
+    'chain': chain_graph,
+    'cliques': cliques_graph,
+}
+
+
+def make_people(people: int, rng: random.Random) -> List[Tuple[str, dt.datetime]]:
+    """Имена и даты рождения; имена уникальны (id FunctionalPerson - хэш имени и даты)"""
+    start = dt.datetime(1950, 1, 1)
+    return [(f"name{i}", start + dt.timedelta(days=rng.randrange(25000))) for i in range(people)]
+
+
+def build_objects(cls: Callable[[str, dt.datetime], Any],
+                  people: List[Tuple[str, dt.datetime]], edges: Edges) -> List[Any]:
+    """Создает объекты с add_friend и связывает их; корень - первый в списке"""
+    persons = [cls(name, born_in) for name, born_in in people]
+    for a, b in edges:
+        if a != b:
+            persons[a].add_friend(persons[b])
+    return persons
@@ -0,0 +1,221 @@
+"""
+Запросы к декодированному графу
+Друзья на k шагов, общие друзья, кратчайшая цепочка знакомств.
+Граф один раз переводится в плотные индексы с отсортированными списками
+смежности и степенями, дальше все запросы работают по ним; повторные
+запросы берутся из LRU-кэша.
+
+Поддерживаются все модели Lab_3:
+    GraphQuery.from_person(root)        - объекты Person / FunctionalPerson
+    GraphQuery.from_dicts(persons_list) - список словарей funct2
+    GraphQuery.from_store(store)        - колоночное хранилище funct2
+Индексы не следят за изменениями графа: после изменений нужен новый GraphQuery.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from traversal import traverse
+
+Adjacency = List[Tuple[int, ...]]
+
+
+class GraphQuery:
+    """Индекс графа и запросы по нему"""
+
+    def __init__(self, nodes: Sequence[Any], adjacency: Adjacency,
+                 resolve: Callable[[Any], int], cache_size: int = 1024) -> None:
+        self._nodes = nodes
+        self._adjacency = adjacency
+        self._degree = [len(friends) for friends in adjacency]
+        self._resolve = resolve
+        # Кэши на экземпляр, чтобы они жили и умирали вместе с графом
+        self._cached_k_hop = lru_cache(maxsize=cache_size)(self._k_hop)
+        self._cached_mutual = lru_cache(maxsize=cache_size)(self._mutual)
+        self._cached_path = lru_cache(maxsize=cache_size)(self._path)
+
+    # === Построение индекса ===
+
+    @classmethod
+    def from_person(cls, root: Any, cache_size: int = 1024) -> 'GraphQuery':
+        """Граф объектов с get_friends()/friends_view(), достижимых из root"""
+        def neighbours(p: Any) -> Any:
+            return p.friends_view() if hasattr(p, 'friends_view') else p.get_friends()
+
+        nodes = list(traverse(root, lambda p: p, neighbours))
+        index: Dict[Any, int] = {p: i for i, p in enumerate(nodes)}
+        adjacency = [tuple(sorted(index[f] for f in neighbours(p))) for p in nodes]
+
+        def resolve(node: Any) -> int:
+            try:
+                return index[node]
+            except KeyError:
+                raise KeyError(f"Человек не из этого графа: {node!r}") from None
+
+        return cls(nodes, adjacency, resolve, cache_size)
+
+    @classmethod
+    def from_dicts(cls, persons_list: List[Dict[str, Any]], cache_size: int = 1024) -> 'GraphQuery':
+        """Список словарей funct2 (друзья - индексы в списке)"""
+        id_index = {person['id']: i for i, person in enumerate(persons_list)}
+        adjacency = [tuple(sorted(set(person['friends']))) for person in persons_list]
+        return cls(persons_list, adjacency, lambda person: id_index[person['id']], cache_size)
+
+    @classmethod
+    def from_store(cls, store: Dict[str, Any], cache_size: int = 1024) -> 'GraphQuery':
+        """Колоночное хранилище funct2; вершины задаются индексами"""
+        if store['pending']:
+            raise ValueError("Есть непримененные дружбы, сначала вызовите store_finalise")
+        offsets, neighbours = store['offsets'], store['neighbours']
+        count = len(store['ids'])
+        adjacency = [tuple(sorted(neighbours[offsets[i]:offsets[i + 1]])) for i in range(count)]
+
+        def resolve(index: int) -> int:
+            if not 0 <= index < count:
+                raise KeyError(f"Нет человека с индексом {index}")
+            return index
+
+        return cls(range(count), adjacency, resolve, cache_size)
+
+    # === Запросы ===
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def degree(self, node: Any) -> int:
+        """Число друзей"""
+        return self._degree[self._resolve(node)]
+
+    def neighbourhood(self, node: Any, hops: int) -> List[Any]:
+        """Все, до кого не больше hops шагов (без самого человека), по уровням"""
+        return [self._nodes[i] for i in self._cached_k_hop(self._resolve(node), hops)]
+
+    def mutual_friends(self, a: Any, b: Any) -> List[Any]:
+        """Общие друзья двух людей"""
+        i, j = self._resolve(a), self._resolve(b)
+        if i > j:
+            i, j = j, i
+        return [self._nodes[k] for k in self._cached_mutual(i, j)]
+
+    def shortest_path(self, a: Any, b: Any) -> Optional[List[Any]]:
+        """Кратчайшая цепочка знакомств от a до b (включительно) или None"""
+        path = self._cached_path(self._resolve(a), self._resolve(b))
+        return None if path is None else [self._nodes[k] for k in path]
+
+    def degrees_of_separation(self, a: Any, b: Any) -> Optional[int]:
+        """Число рукопожатий между a и b или None, если они не связаны"""
+        path = self._cached_path(self._resolve(a), self._resolve(b))
+        return None if path is None else len(path) - 1
+
+    def cache_clear(self) -> None:
+        self._cached_k_hop.cache_clear()
+        self._cached_mutual.cache_clear()
+        self._cached_path.cache_clear()
+
+    # === Реализация по индексам ===
+
+    def _k_hop(self, start: int, hops: int) -> Tuple[int, ...]:
+        adjacency = self._adjacency
+        seen = {start}
+        result: List[int] = []
+        frontier = [start]
+        for _ in range(hops):
+            next_frontier = []
+            for u in frontier:
+                for v in adjacency[u]:
+                    if v not in seen:
+                        seen.add(v)
+                        next_frontier.append(v)
+            if not next_frontier:
+                break
+            result.extend(next_frontier)
+            frontier = next_frontier
+        return tuple(result)
+
+    def _mutual(self, i: int, j: int) -> Tuple[int, ...]:
+        # Пересечение двух отсортированных списков слиянием
+        left, right = self._adjacency[i], self._adjacency[j]
+        result = []
+        x = y = 0
+        while x < len(left) and y < len(right):
+            if left[x] < right[y]:
+                x += 1
+            elif left[x] > right[y]:
+                y += 1
+            else:
+                result.append(left[x])
+                x += 1
+                y += 1
+        return tuple(result)
+
+    def _path(self, source: int, target: int) -> Optional[Tuple[int, ...]]:
+        """Двунаправленный BFS: каждый раз расширяем более дешевый фронт"""
+        if source == target:
+            return (source,)
+        adjacency, degree = self._adjacency, self._degree
+        parents = ({source: -1}, {target: -1})
+        frontiers = ([source], [target])
+
+        while frontiers[0] and frontiers[1]:
+            cost = [sum(degree[u] for u in frontier) for frontier in frontiers]
+            side = 0 if cost[0] <= cost[1] else 1
+            mine, other = parents[side], parents[1 - side]
+
+            # Расширяем целый уровень и берем лучшую точку встречи
+            next_frontier = []
+            meetings = []
+            for u in frontiers[side]:
+                for v in adjacency[u]:
+                    if v not in mine:
+                        mine[v] = u
+                        next_frontier.append(v)
+                        if v in other:
+                            meetings.append(v)
+            if meetings:
+                best = min(meetings, key=lambda v: self._depth(parents[1 - side], v))
+                return self._join(parents[0], parents[1], best)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    @staticmethod
+    def _depth(parents: Dict[int, int], node: int) -> int:
+        depth = 0
+        while parents[node] != -1:
+            node = parents[node]
+            depth += 1
+        return depth
+
+    @staticmethod
+    def _join(forward: Dict[int, int], backward: Dict[int, int], meet: int) -> Tuple[int, ...]:
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = forward[node]
+        path.reverse()
+        node = backward[meet]
+        while node != -1:
+            path.append(node)
+            node = backward[node]
+        return tuple(path)
+
+
+# === Пример использования ===
+if __name__ == "__main__":
+    import datetime as dt
+    from OOp import Person
+
+    people = {name: Person(name, dt.datetime(2000, 1, 1))
+              for name in ("Ivan", "Petr", "Anna", "Maria", "Olga")}
+    people["Ivan"].add_friend(people["Petr"])
+    people["Ivan"].add_friend(people["Anna"])
+    people["Petr"].add_friend(people["Anna"])
+    people["Anna"].add_friend(people["Maria"])
+    people["Maria"].add_friend(people["Olga"])
+
+    query = GraphQuery.from_person(people["Ivan"])
+    print("=== Запросы к графу ===")
+    print(f"Друзья друзей Ивана: {[p.get_name() for p in query.neighbourhood(people['Ivan'], 2)]}")
+    print(f"Общие друзья Ивана и Петра: {[p.get_name() for p in query.mutual_friends(people['Ivan'], people['Petr'])]}")
+    path = query.shortest_path(people["Ivan"], people["Olga"])
+    print(f"Цепочка Иван -> Ольга: {' -> '.join(p.get_name() for p in path)}")
+    print(f"Рукопожатий: {query.degrees_of_separation(people['Ivan'], people['Olga'])}")
@@ -0,0 +1,304 @@
+"""
+asyncio-сервер снимков графа Person
+Граф публикуется версиями; клиент запрашивает версию и получает
+закодированный снимок кусками по TCP или Unix-сокету.
+Кодирование выполняется в пуле процессов, число одновременных
+кодирований ограничено; один и тот же снимок кодируется один раз
+и раздается всем читателям этой версии.
+
+Протокол (строки ASCII):
+    клиент: GET <версия|latest>\\n
+    сервер: OK <версия> <длина>\\n и затем <длина> байт
+            или ERR <сообщение>\\n
+Соединение можно использовать для нескольких запросов подряд.
+
+Запуск нагрузочного теста на loopback:
+    python graph_server.py --people 5000 --clients 16 --requests 50
+"""
+import argparse
+import asyncio
+import bz2
+import json
+import multiprocessing
+import random
+import lzma
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import profiles
+from OOp import Person, person_record, compact_record
+from graph_generators import random_graph, make_people, build_objects
+from profiles import READABLE, FAST
+from stream_io import DEFAULT_CHUNK_SIZE
+from traversal import traverse
+
+# Запись без ссылок на объекты (можно передать в другой процесс)
+Record = Tuple[str, str, Any, List[str]]
+
+_COMPRESS: Dict[Optional[str], Callable[[bytes], bytes]] = {
+    None: lambda data: data,
+    'zlib': zlib.compress,
+    'lzma': lzma.compress,
+    'bz2': bz2.compress,
+}
+
+
+def encode_records(records: List[Record], profile: str = READABLE,
+                   compression: Optional[str] = None) -> bytes:
+    """
+    Кодирует снимок в формат PersonSerializer (выполняется в рабочем процессе).
+    Результат читается PersonSerializer.decode (после распаковки).
+    """
+    if profile == FAST:
+        data = profiles.dump_fast([compact_record(*record) for record in records])
+    else:
+        data = json.dumps([person_record(*record) for record in records], indent=2).encode('utf-8')
+    return _COMPRESS[compression](data)
+
+
+class GraphServer:
+    """
+    Раздает версии графа многим клиентам.
+    Рабочие процессы запускаются через spawn, поэтому скрипт, создающий
+    сервер, должен делать это под if __name__ == "__main__".
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_encodes: int = 2,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, profile: str = READABLE,
+                 compression: Optional[str] = None, keep_versions: int = 4) -> None:
+        profiles.check_profile(profile)
+        if compression not in _COMPRESS:
+            raise ValueError(f"Неизвестное сжатие: {compression!r}")
+        # spawn, а не fork: рабочие процессы создаются уже при открытых сокетах,
+        # унаследованные копии не дали бы клиенту увидеть закрытие соединения
+        self._pool = ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('spawn'))
+        self._max_encodes = max_encodes
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._chunk_size = chunk_size
+        self._profile = profile
+        self._compression = compression
+        self._keep_versions = keep_versions
+        self._records: Dict[int, List[Record]] = {}
+        self._encoded: Dict[int, 'asyncio.Future[bytes]'] = {}
+        self._latest = 0
+        self._servers: List[asyncio.AbstractServer] = []
+        self._connections: Dict['asyncio.Task[None]', asyncio.StreamWriter] = {}
+
+    # === Версии графа ===
+
+    def publish(self, root: Person) -> int:
+        """
+        Фиксирует текущее состояние графа как новую версию.
+        Дальнейшие изменения объектов на опубликованную версию не влияют.
+        Через геттеры, поэтому подходит и SlottedPerson.
+        """
+        records = [(p.get_id(), p.get_name(), p.get_birth_date(),
+                    [friend.get_id() for friend in p.friends_view()])
+                   for p in traverse(root, lambda p: p._id, lambda p: p.friends_view())]
+        self._latest += 1
+        self._records[self._latest] = records
+        # Старые версии забываем вместе с закодированными снимками
+        for version in [v for v in self._records if v <= self._latest - self._keep_versions]:
+            del self._records[version]
+            self._encoded.pop(version, None)
+        return self._latest
+
+    async def snapshot(self, version: Optional[int] = None) -> Tuple[int, bytes]:
+        """Закодированный снимок версии (по умолчанию последней)"""
+        if version is None:
+            version = self._latest
+        if version not in self._records:
+            raise KeyError(version)
+        future = self._encoded.get(version)
+        if future is None:
+            future = self._encoded[version] = asyncio.ensure_future(self._encode(version))
+        try:
+            # shield: отмена одного читателя не отменяет общее кодирование
+            return version, await asyncio.shield(future)
+        except Exception:
+            # Неудачный результат не кэшируем, следующий запрос попробует снова
+            if self._encoded.get(version) is future and future.done():
+                del self._encoded[version]
+            raise
+
+    async def _encode(self, version: int) -> bytes:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_encodes)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, encode_records, self._records[version],
+                                              self._profile, self._compression)
+
+    # === Сеть ===
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode('ascii', 'replace').split()
+                if len(parts) != 2 or parts[0] != 'GET':
+                    writer.write(b"ERR bad request\n")
+                    await writer.drain()
+                    continue
+                try:
+                    version, data = await self.snapshot(None if parts[1] == 'latest' else int(parts[1]))
+                except (KeyError, ValueError):
+                    writer.write(f"ERR unknown version {parts[1]}\n".encode('ascii', 'replace'))
+                    await writer.drain()
+                    continue
+                except Exception:
+                    # Ошибка кодирования: клиент получает ответ, а не ждет вечно
+                    writer.write(b"ERR encode failed\n")
+                    await writer.drain()
+                    continue
+
+                writer.write(f"OK {version} {len(data)}\n".encode('ascii'))
+                # Кусками с drain: медленный клиент не раздувает буфер сервера
+                view = memoryview(data)
+                for start in range(0, len(data), self._chunk_size):
+                    writer.write(view[start:start + self._chunk_size])
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> Tuple[str, int]:
+        """Слушает TCP; возвращает фактический адрес"""
+        server = await asyncio.start_server(self._handle, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path: str) -> None:
+        """Слушает Unix-сокет"""
+        self._servers.append(await asyncio.start_unix_server(self._handle, path))
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        # Закрытие сокета будит обработчики, ждущие запрос, и они завершаются сами
+        tasks = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pool.shutdown(wait=True)
+
+
+# === Клиент ===
+
+async def fetch(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                version: str = 'latest') -> Tuple[int, bytes]:
+    """Запрашивает снимок по открытому соединению"""
+    writer.write(f"GET {version}\n".encode('ascii'))
+    await writer.drain()
+    header = (await reader.readline()).decode('ascii').split()
+    if not header or header[0] != 'OK':
+        raise RuntimeError(f"Ошибка сервера: {' '.join(header[1:]) or 'соединение закрыто'}")
+    return int(header[1]), await reader.readexactly(int(header[2]))
+
+
+async def run_load(connect: Callable[[], Awaitable[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]],
+                   clients: int, requests: int) -> Dict[str, float]:
+    """
+    Нагрузочный тест: clients соединений, каждое делает requests запросов.
+    Возвращает запросы в секунду и задержки (мс).
+    """
+    latencies: List[float] = []
+    received = 0
+
+    async def client() -> None:
+        nonlocal received
+        reader, writer = await connect()
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                _, data = await fetch(reader, writer)
+                latencies.append(time.perf_counter() - start)
+                received += len(data)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'mb_per_sec': received / elapsed / 1e6,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = GraphServer(workers=args.workers, max_encodes=args.max_encodes,
+                         profile=args.profile, compression=args.compression)
+    rng = random.Random(args.seed)
+    root = build_objects(Person, make_people(args.people, rng),
+                         random_graph(args.people, rng, degree=args.degree))[0]
+    server.publish(root)
+
+    if args.unix:
+        await server.start_unix(args.unix)
+        address = args.unix
+
+        async def connect() -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+            return await asyncio.open_unix_connection(args.unix)
+    else:
+        host, port = await server.start()
+        address = f"{host}:{port}"
+
+        async def connect() -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+            return await asyncio.open_connection(host, port)
+
+    try:
+        # Первый запрос кодирует снимок, дальше он берется из кэша
+        first = time.perf_counter()
+        reader, writer = await connect()
+        _, data = await fetch(reader, writer)
+        writer.close()
+        cold = (time.perf_counter() - first) * 1000
+
+        # Новая версия во время нагрузки: читатели одной версии делят одно кодирование
+        server.publish(root)
+        stats = await run_load(connect, args.clients, args.requests)
+    finally:
+        await server.close()
+
+    print(f"=== Сервер снимков графа ({address}) ===")
+    print(f"Людей: {args.people}, размер снимка: {len(data)} байт, первый запрос: {cold:.1f} мс")
+    print(f"Клиентов: {args.clients}, запросов: {stats['requests']}")
+    print(f"Запросов/с: {stats['rps']:.1f}, p50: {stats['p50_ms']:.2f} мс, "
+          f"p99: {stats['p99_ms']:.2f} мс, {stats['mb_per_sec']:.1f} МБ/с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервера снимков графа")
+    parser.add_argument('--people', type=int, default=5000)
+    parser.add_argument('--degree', type=int, default=6)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help="запросов на клиента")
+    parser.add_argument('--workers', type=int, default=None, help="процессов для кодирования")
+    parser.add_argument('--max-encodes', type=int, default=2, help="одновременных кодирований")
+    parser.add_argument('--profile', choices=(READABLE, FAST), default=READABLE)
+    parser.add_argument('--compression', choices=('zlib', 'lzma', 'bz2'), default=None)
+    parser.add_argument('--unix', help="путь Unix-сокета вместо TCP")
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,68 @@
+"""
+Профили кодирования для сериализаторов Lab_3
+READABLE - прежний формат: JSON с отступами, даты ISO-строками.
+FAST     - компактный JSON без пробелов, люди - массивами
+           [id, имя, дата, [id друзей]], даты - микросекунды от эпохи.
+           Помечен полем "format", по нему декодеры сами выбирают разбор.
+"""
+import datetime as dt
+import json
+import sys
+from typing import Any, Dict, List, Tuple, Union
+
+from epoch import to_epoch_us, from_epoch_us
+
+READABLE = 'readable'
+FAST = 'fast'
+FAST_FORMAT = 'person-graph/fast-1'
+_FAST_PREFIX = json.dumps({'format': FAST_FORMAT}, separators=(',', ':'))[:-1].encode('utf-8')
+
+
+def check_profile(profile: str) -> None:
+    if profile not in (READABLE, FAST):
+        raise ValueError(f"Неизвестный профиль кодирования: {profile!r}")
+
+
+def encode_date(value: dt.datetime) -> Union[int, str]:
+    """Дата для быстрого профиля: целое число, а дата с поясом - ISO-строкой"""
+    return value.isoformat() if value.tzinfo is not None else to_epoch_us(value)
+
+
+def decode_date(value: Union[int, str]) -> dt.datetime:
+    return from_epoch_us(value) if isinstance(value, int) else dt.datetime.fromisoformat(value)
+
+
+def dump_fast(persons: Any, **header: Any) -> bytes:
+    """Быстрый профиль: маркер формата, поля заголовка и список людей"""
+    document = {'format': FAST_FORMAT}
+    document.update(header)
+    document['persons'] = persons
+    return json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+
+def is_fast(data: bytes) -> bool:
+    """Быстрый ли профиль, без разбора всего документа (маркер пишется первым)"""
+    return data[:len(_FAST_PREFIX) + 64].lstrip().startswith(_FAST_PREFIX)
+
+
+def load(data: bytes) -> Tuple[Any, bool]:
+    """Разбирает JSON и определяет профиль: (документ, это быстрый профиль)"""
+    parsed = json.loads(data)
+    return parsed, isinstance(parsed, dict) and parsed.get('format') == FAST_FORMAT
+
+
+def fast_records(document: Dict[str, Any]) -> List[List[Any]]:
+    """
+    Записи быстрого профиля: [id, имя, дата, id друзей], даты уже datetime.
+    Строки id и имен, которые остаются в графе, интернируются:
+    одинаковые имена хранятся один раз. id друзей нужны только для
+    поиска и после декодирования не хранятся, их не трогаем.
+    Записи преобразуются на месте, без копирования списка.
+    """
+    intern = sys.intern
+    records = document['persons']
+    for record in records:
+        record[0] = intern(record[0])
+        record[1] = intern(record[1])
+        record[2] = decode_date(record[2])
+    return records
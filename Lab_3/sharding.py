@@ -0,0 +1,124 @@
+"""
+Параллельное кодирование графа по шардам
+Люди в порядке обхода делятся на N шардов подряд идущими диапазонами,
+каждый шард кодируется в отдельном процессе. Ссылки на друзей хранятся
+по id, поэтому шарды независимы; при декодировании шарды разбираются
+параллельно, а связи между ними восстанавливает вызывающий код на общем
+этапе слияния.
+
+Рабочие процессы запускаются через fork и наследуют объекты (или байты)
+без pickle: в процесс передаются только границы шарда, обратно - байты
+шарда или его записи. Объекты в записи превращает сам рабочий процесс,
+в главном остаются только обход графа и слияние. Где fork нет (Windows),
+шарды обрабатываются в этом процессе: передавать объекты через pickle
+дороже, чем закодировать их на месте.
+
+Формат:
+    строка-заголовок JSON: {"type": "PersonShards", "root_id": ..., "count": ..., "sizes": [...]}
+    затем подряд байты шардов в порядке записей, каждый - компактный
+    JSON-массив записей [id, имя, дата ISO, [id друзей]]
+"""
+import datetime as dt
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# Запись человека без ссылок на объекты: id, имя, дата, id друзей
+Record = Tuple[str, str, dt.datetime, List[str]]
+Bounds = Tuple[int, int]
+
+MANIFEST_TYPE = 'PersonShards'
+
+_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+# Общие данные вызова; задаются только в рабочем процессе (_init_worker)
+_shared: Any = None
+
+
+def _init_worker(shared: Any) -> None:
+    global _shared
+    _shared = shared
+
+
+def _in_worker(task: Tuple[Callable[[Any, Bounds], Any], Bounds]) -> Any:
+    func, bounds = task
+    return func(_shared, bounds)
+
+
+def _map(func: Callable[[Any, Bounds], Any], shared: Any, bounds: List[Bounds],
+         processes: Optional[int]) -> List[Any]:
+    """
+    Вызывает func(shared, границы) для каждого шарда в пуле процессов
+    (или в этом процессе, если нужен один процесс или нет fork)
+    """
+    workers = min(processes or os.cpu_count() or 1, len(bounds))
+    if workers <= 1 or not _FORK:
+        return [func(shared, item) for item in bounds]
+    # При fork initargs не сериализуются - процессы получают shared как есть
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                             initializer=_init_worker, initargs=(shared,)) as pool:
+        return list(pool.map(_in_worker, [(func, item) for item in bounds]))
+
+
+def _encode_shard(shared: Tuple[Sequence[Any], Callable[[Any], Record]], bounds: Bounds) -> bytes:
+    """Превращает людей шарда в записи и кодирует их (в рабочем процессе)"""
+    items, to_record = shared
+    rows = []
+    for index in range(*bounds):
+        person_id, name, born_in, friends = to_record(items[index])
+        rows.append([person_id, name, born_in.isoformat(), friends])
+    return json.dumps(rows, separators=(',', ':')).encode('utf-8')
+
+
+def _decode_shard(data: bytes, bounds: Bounds) -> List[Record]:
+    """Разбирает один шард (в рабочем процессе)"""
+    start, end = bounds
+    fromisoformat = dt.datetime.fromisoformat
+    return [(person_id, name, fromisoformat(born_in), friends)
+            for person_id, name, born_in, friends in json.loads(data[start:end])]
+
+
+def encode_shards(items: Sequence[Any], to_record: Callable[[Any], Record], root_id: str,
+                  shards: int = 4, processes: Optional[int] = None) -> bytes:
+    """
+    Кодирует людей по шардам; to_record превращает человека в запись
+    и вызывается в рабочих процессах. Порядок items сохраняется.
+    processes=None - по числу ядер, 1 - без пула процессов.
+    """
+    if shards < 1:
+        raise ValueError("Число шардов должно быть положительным")
+    count = len(items)
+    bounds = [(count * k // shards, count * (k + 1) // shards) for k in range(shards)]
+    payloads = _map(_encode_shard, (items, to_record), bounds, processes)
+    manifest = {
+        'type': MANIFEST_TYPE,
+        'root_id': root_id,
+        'count': count,
+        'sizes': [len(payload) for payload in payloads],
+    }
+    return json.dumps(manifest).encode('utf-8') + b'\n' + b''.join(payloads)
+
+
+def decode_shards(data: bytes, processes: Optional[int] = None) -> Tuple[str, List[Record]]:
+    """Разбирает шарды параллельно, возвращает root_id и записи в исходном порядке"""
+    header_end = data.find(b'\n')
+    manifest = json.loads(data[:header_end]) if header_end >= 0 else None
+    if not isinstance(manifest, dict) or manifest.get('type') != MANIFEST_TYPE:
+        raise ValueError("Это не шардированный граф Person")
+
+    bounds = []
+    offset = header_end + 1
+    for size in manifest['sizes']:
+        bounds.append((offset, offset + size))
+        offset += size
+    if offset != len(data):
+        raise ValueError("Размеры шардов не совпадают с данными")
+
+    records: List[Record] = []
+    for rows in _map(_decode_shard, data, bounds, processes):
+        records.extend(rows)
+    if len(records) != manifest['count']:
+        raise ValueError("Число записей не совпадает с заголовком")
+    return manifest['root_id'], records
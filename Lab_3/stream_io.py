@@ -0,0 +1,155 @@
+"""
+Потоковый ввод-вывод для сериализаторов Lab_3
+Данные пишутся и читаются кусками фиксированного размера через
+необязательное сжатие из стандартной библиотеки (zlib, lzma, bz2),
+поэтому весь закодированный граф никогда не лежит в памяти целиком.
+Подходят файлы, io.BufferedIOBase и сокеты (write/sendall, read/recv).
+
+Формат внутри (после распаковки) - NDJSON: одна JSON-запись на строку.
+"""
+import bz2
+import json
+import lzma
+import zlib
+from typing import Any, Callable, Iterator, Optional
+
+COMPRESSIONS = (None, 'zlib', 'lzma', 'bz2')
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _compressor(compression: Optional[str]) -> Any:
+    if compression is None:
+        return None
+    if compression == 'zlib':
+        return zlib.compressobj()
+    if compression == 'lzma':
+        return lzma.LZMACompressor()
+    if compression == 'bz2':
+        return bz2.BZ2Compressor()
+    raise ValueError(f"Неизвестное сжатие: {compression!r}, доступны {COMPRESSIONS}")
+
+
+def _detect_decompressor(head: bytes) -> Any:
+    """Определяет сжатие по первым байтам потока"""
+    if head.startswith(b'\xfd7zXZ\x00'):
+        return lzma.LZMADecompressor()
+    if head.startswith(b'BZh'):
+        return bz2.BZ2Decompressor()
+    if len(head) >= 2 and head[0] & 0x0F == 8 and (head[0] << 8 | head[1]) % 31 == 0:
+        return zlib.decompressobj()
+    return None
+
+
+class ChunkedWriter:
+    """
+    Файловый объект только для записи: копит данные до chunk_size,
+    сжимает и отправляет кусками в fileobj. Сам fileobj не закрывает.
+    """
+
+    def __init__(self, fileobj: Any, compression: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if chunk_size <= 0:
+            raise ValueError("Размер куска должен быть положительным")
+        self._send: Callable[[bytes], Any] = getattr(fileobj, 'write', None) or fileobj.sendall
+        self._compressor = _compressor(compression)
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._flush_buffer()
+        return len(data)
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self._send(data)
+            self.bytes_written += len(data)
+
+    def _flush_buffer(self) -> None:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._emit(self._compressor.compress(data) if self._compressor else data)
+
+    def close(self) -> None:
+        """Дописывает остаток и завершает поток сжатия"""
+        self._flush_buffer()
+        if self._compressor is not None:
+            self._emit(self._compressor.flush())
+            self._compressor = None
+
+    def __enter__(self) -> 'ChunkedWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def iter_chunks(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Читает fileobj кусками до конца и распаковывает их;
+    сжатие определяется автоматически по первым байтам.
+    """
+    read: Callable[[int], bytes] = getattr(fileobj, 'read', None) or fileobj.recv
+    decompressor = None
+    first = True
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        if first:
+            # Для определения сжатия нужно хотя бы несколько байт
+            while len(chunk) < 6:
+                more = read(chunk_size)
+                if not more:
+                    break
+                chunk += more
+            decompressor = _detect_decompressor(chunk)
+            first = False
+        if decompressor is None:
+            yield chunk
+            continue
+        # Ограничиваем размер распакованного куска, чтобы не раздувать память
+        yield decompressor.decompress(chunk, chunk_size)
+        yield from _drain(decompressor, chunk_size)
+
+
+def _drain(decompressor: Any, chunk_size: int) -> Iterator[bytes]:
+    """Выдает то, что распаковщик придержал из-за ограничения размера"""
+    while True:
+        if hasattr(decompressor, 'unconsumed_tail'):
+            # zlib: необработанный остаток лежит в unconsumed_tail
+            tail = decompressor.unconsumed_tail
+            if not tail:
+                return
+            yield decompressor.decompress(tail, chunk_size)
+        else:
+            # lzma/bz2: needs_input=False - есть готовые данные
+            if decompressor.needs_input or decompressor.eof:
+                return
+            yield decompressor.decompress(b'', chunk_size)
+
+
+def iter_lines(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Строки распакованного потока (без перевода строки)"""
+    pending = b''
+    for chunk in iter_chunks(fileobj, chunk_size):
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_records(fileobj: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Разобранные JSON-записи потока NDJSON, пустые строки пропускаются"""
+    for line in iter_lines(fileobj, chunk_size):
+        if line.strip():
+            yield json.loads(line)
+
+
+def write_record(writer: ChunkedWriter, record: Any) -> None:
+    """Пишет одну запись NDJSON"""
+    writer.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
@@ -0,0 +1,63 @@
+"""
+Обход графа без рекурсии
+Явный стек (DFS) или очередь (BFS) вместо вызова функции на каждого друга,
+поэтому длинные цепочки друзей не упираются в лимит рекурсии.
+"""
+from collections import deque
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+DFS = 'dfs'
+BFS = 'bfs'
+
+
+def traverse(root: Any,
+             get_key: Callable[[Any], Hashable],
+             get_neighbours: Callable[[Any], Iterable[Any]],
+             order: str = DFS) -> Iterator[Any]:
+    """
+    Обходит граф от root и выдает каждую вершину ровно один раз.
+
+    order=DFS дает тот же порядок, что и рекурсивный обход в прямом
+    порядке (вершина, затем по очереди поддеревья друзей).
+    order=BFS обходит граф по уровням.
+    Время работы O(V + E), соседи каждой вершины запрашиваются один раз.
+    """
+    if order == DFS:
+        return _traverse_dfs(root, get_key, get_neighbours)
+    if order == BFS:
+        return _traverse_bfs(root, get_key, get_neighbours)
+    raise ValueError(f"Неизвестный порядок обхода: {order!r}")
+
+
+def _traverse_dfs(root: Any,
+                  get_key: Callable[[Any], Hashable],
+                  get_neighbours: Callable[[Any], Iterable[Any]]) -> Iterator[Any]:
+    visited = {get_key(root)}
+    yield root
+    # Стек итераторов повторяет кадры рекурсивного вызова
+    stack = [iter(get_neighbours(root))]
+    while stack:
+        for node in stack[-1]:
+            key = get_key(node)
+            if key not in visited:
+                visited.add(key)
+                yield node
+                stack.append(iter(get_neighbours(node)))
+                break
+        else:
+            stack.pop()
+
+
+def _traverse_bfs(root: Any,
+                  get_key: Callable[[Any], Hashable],
+                  get_neighbours: Callable[[Any], Iterable[Any]]) -> Iterator[Any]:
+    visited = {get_key(root)}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        yield node
+        for neighbour in get_neighbours(node):
+            key = get_key(neighbour)
+            if key not in visited:
+                visited.add(key)
+                queue.append(neighbour)
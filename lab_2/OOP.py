@@ -62,54 +62,56 @@ class Matrix:
         return "\n".join(lines)
 
 
-print("=" * 40)
-print("ООП СТИЛЬ")
-print("=" * 40)
-
-# Создаем матрицы
-A = Matrix([[1, 2, 3],
-            [4, 5, 6]])
-B = Matrix([[2, 0, 1],
-            [1, 2, 3]])
-C = Matrix([[1, 2],
-            [3, 4],
-            [5, 6]])
-
-print("Матрица A (2x3):")
-print(A)
-print("\nМатрица B (2x3):")
-print(B)
-print("\nМатрица C (3x2):")
-print(C)
-
-# Сложение
-print("\n1. Сложение A + B:")
-print(A + B)
-
-print("Сложение A + C:")
-print(A + C)
-
-# Умножение на скаляр
-print("\n2. Умножение A * 2:")
-print(A * 2)
-
-print("Умножение B * 2:")
-print(B * 2)
-
-print("Умножение C * 2:")
-print(C * 2)
-
-# Умножение матриц
-print("\n3. Умножение матриц A * C:")
-print(A * C)
-
-print("Умножение матриц B * C:")
-print(B * C)
-
-# Транспонирование
-print("\n4. Транспонирование A:")
-print(A.transpose())
-print("Транспонирование B:")
-print(B.transpose())
-print("Транспонирование C:")
-print(C.transpose())
\ No newline at end of file
+# === Пример использования ===
+if __name__ == "__main__":
+    print("=" * 40)
+    print("ООП СТИЛЬ")
+    print("=" * 40)
+
+    # Создаем матрицы
+    A = Matrix([[1, 2, 3],
+                [4, 5, 6]])
+    B = Matrix([[2, 0, 1],
+                [1, 2, 3]])
+    C = Matrix([[1, 2],
+                [3, 4],
+                [5, 6]])
+
+    print("Матрица A (2x3):")
+    print(A)
+    print("\nМатрица B (2x3):")
+    print(B)
+    print("\nМатрица C (3x2):")
+    print(C)
+
+    # Сложение
+    print("\n1. Сложение A + B:")
+    print(A + B)
+
+    print("Сложение A + C:")
+    print(A + C)
+
+    # Умножение на скаляр
+    print("\n2. Умножение A * 2:")
+    print(A * 2)
+
+    print("Умножение B * 2:")
+    print(B * 2)
+
+    print("Умножение C * 2:")
+    print(C * 2)
+
+    # Умножение матриц
+    print("\n3. Умножение матриц A * C:")
+    print(A * C)
+
+    print("Умножение матриц B * C:")
+    print(B * C)
+
+    # Транспонирование
+    print("\n4. Транспонирование A:")
+    print(A.transpose())
+    print("Транспонирование B:")
+    print(B.transpose())
+    print("Транспонирование C:")
+    print(C.transpose())
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+Бенчмарк матричных операций: ООП (Matrix) против функционального стиля
+(add_matrices / multiply_matrices / multiply_scalar / transpose_matrix).
+
+Перебирает формы матриц (квадратные, высокие, широкие, пачка маленьких)
+и типы элементов (int, float). Для каждой операции и каждого бэкенда
+измеряет операции в секунду, число выделенных блоков памяти и пиковую
+память. Результаты сохраняются в JSON и сравниваются с сохраненным
+эталоном с заданным порогом регрессии.
+
+Запуск:
+    python bench.py --output results.json
+    python bench.py --baseline results.json --threshold 0.15
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from OOP import Matrix
+from funct import (create_matrix, add_matrices, multiply_matrices,
+                   multiply_scalar, transpose_matrix)
+
+# Формы: имя -> (строки, столбцы, размер пачки)
+SHAPES: Dict[str, Tuple[int, int, int]] = {
+    'square': (48, 48, 1),
+    'tall': (192, 12, 1),
+    'wide': (12, 192, 1),
+    'tiny_batch': (3, 3, 500),
+}
+
+QUICK_SHAPES: Dict[str, Tuple[int, int, int]] = {
+    'square': (16, 16, 1),
+    'tall': (64, 4, 1),
+    'wide': (4, 64, 1),
+    'tiny_batch': (3, 3, 50),
+}
+
+DTYPES = ('int', 'float')
+OPERATIONS = ('add', 'scalar', 'matmul', 'transpose')
+BACKENDS = ('oop', 'functional')
+
+
+def random_data(rows: int, cols: int, dtype: str,
+                rng: random.Random) -> List[List[Any]]:
+    """Создает матрицу (список строк) со случайными элементами"""
+    if dtype == 'int':
+        return [[rng.randint(-100, 100) for _ in range(cols)] for _ in range(rows)]
+    return [[rng.uniform(-100.0, 100.0) for _ in range(cols)] for _ in range(rows)]
+
+
+def make_case(backend: str, op: str, shape: Tuple[int, int, int], dtype: str,
+              rng: random.Random) -> Callable[[], Any]:
+    """
+    Готовит входные данные и возвращает функцию без аргументов,
+    выполняющую одну операцию над всей пачкой матриц.
+    """
+    rows, cols, batch = shape
+    wrap = Matrix if backend == 'oop' else create_matrix
+
+    lefts = [wrap(random_data(rows, cols, dtype, rng)) for _ in range(batch)]
+    if op == 'add':
+        rights = [wrap(random_data(rows, cols, dtype, rng)) for _ in range(batch)]
+    elif op == 'matmul':
+        # Для высоких и широких матриц умножаем на транспонированную форму
+        rights = [wrap(random_data(cols, rows, dtype, rng)) for _ in range(batch)]
+    else:
+        rights = []
+    scalar = 3 if dtype == 'int' else 1.5
+    pairs = list(zip(lefts, rights))
+
+    if backend == 'oop':
+        if op == 'add':
+            return lambda: [a + b for a, b in pairs]
+        if op == 'matmul':
+            return lambda: [a * b for a, b in pairs]
+        if op == 'scalar':
+            return lambda: [a * scalar for a in lefts]
+        return lambda: [a.transpose() for a in lefts]
+
+    if op == 'add':
+        return lambda: [add_matrices(a, b) for a, b in pairs]
+    if op == 'matmul':
+        return lambda: [multiply_matrices(a, b) for a, b in pairs]
+    if op == 'scalar':
+        return lambda: [multiply_scalar(a, scalar) for a in lefts]
+    return lambda: [transpose_matrix(a) for a in lefts]
+
+
+def measure_speed(func: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """
+    Возвращает лучшее число операций в секунду из repeat замеров.
+    Каждый замер длится не меньше min_time секунд.
+    """
+    # Подбираем число вызовов на один замер
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return 1.0 / best if best > 0 else float('inf')
+
+
+def measure_memory(func: Callable[[], Any]) -> Tuple[int, int]:
+    """
+    Возвращает (число выделенных и удерживаемых результатом блоков,
+    пиковую память в байтах) для одного вызова.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename')
+                 if stat.count_diff > 0)
+    del result
+    return blocks, peak - base
+
+
+def run_benchmarks(shapes: Dict[str, Tuple[int, int, int]], repeat: int,
+                   min_time: float, seed: int) -> List[Dict[str, Any]]:
+    """Прогоняет все сочетания бэкенд/форма/тип/операция"""
+    results = []
+    for shape_name, shape in shapes.items():
+        for dtype in DTYPES:
+            for op in OPERATIONS:
+                for backend in BACKENDS:
+                    # Одинаковое зерно -> одинаковые данные для обоих бэкендов
+                    rng = random.Random(f"{seed}:{shape_name}:{dtype}:{op}")
+                    func = make_case(backend, op, shape, dtype, rng)
+                    ops_per_sec = measure_speed(func, repeat, min_time)
+                    blocks, peak = measure_memory(func)
+                    results.append({
+                        'backend': backend,
+                        'shape': shape_name,
+                        'size': list(shape),
+                        'dtype': dtype,
+                        'op': op,
+                        'ops_per_sec': ops_per_sec,
+                        'alloc_blocks': blocks,
+                        'peak_bytes': peak,
+                    })
+    return results
+
+
+def result_key(result: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    return result['backend'], result['shape'], result['dtype'], result['op']
+
+
+def compare_with_baseline(results: List[Dict[str, Any]],
+                          baseline: List[Dict[str, Any]],
+                          threshold: float) -> List[str]:
+    """
+    Сравнивает результаты с эталоном.
+    Возвращает список описаний регрессий (пустой, если их нет).
+    """
+    baseline_by_key = {result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = baseline_by_key.get(result_key(result))
+        if old is None:
+            continue
+        if result['ops_per_sec'] < old['ops_per_sec'] * (1 - threshold):
+            regressions.append(
+                f"{'/'.join(result_key(result))}: скорость "
+                f"{old['ops_per_sec']:.1f} -> {result['ops_per_sec']:.1f} оп/с")
+        if result['peak_bytes'] > old['peak_bytes'] * (1 + threshold):
+            regressions.append(
+                f"{'/'.join(result_key(result))}: пиковая память "
+                f"{old['peak_bytes']} -> {result['peak_bytes']} байт")
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Выводит результаты таблицей"""
+    print(f"{'форма':<11}{'тип':<7}{'операция':<11}{'бэкенд':<12}"
+          f"{'оп/с':>12}{'блоков':>10}{'пик, байт':>12}")
+    for r in results:
+        print(f"{r['shape']:<11}{r['dtype']:<7}{r['op']:<11}{r['backend']:<12}"
+              f"{r['ops_per_sec']:>12.1f}{r['alloc_blocks']:>10}{r['peak_bytes']:>12}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк матриц: ООП против функционального стиля")
+    parser.add_argument('--output', help="куда сохранить результаты (JSON)")
+    parser.add_argument('--baseline', help="эталонный JSON для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="допустимое ухудшение (доля, по умолчанию 0.10)")
+    parser.add_argument('--repeat', type=int, default=5, help="число замеров")
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help="минимальная длительность замера, с")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора")
+    parser.add_argument('--quick', action='store_true', help="маленькие размеры")
+    args = parser.parse_args(argv)
+
+    shapes = QUICK_SHAPES if args.quick else SHAPES
+    results = run_benchmarks(shapes, args.repeat, args.min_time, args.seed)
+    print_table(results)
+
+    if args.output:
+        report = {
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'seed': args.seed,
+                'quick': args.quick,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nРезультаты сохранены в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nРегрессии (порог {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
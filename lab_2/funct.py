@@ -1,8 +1,3 @@
-print("\n" + "=" * 50)
-print("ФУНКЦИОНАЛЬНЫЙ СТИЛЬ")
-print("=" * 50)
-
-
 # Создание матрицы
 def create_matrix(data):
     return {
@@ -77,72 +72,78 @@ def matrix_to_string(m):
         return str(m)
 
 
-# Создаем матрицы
-A_func = create_matrix([[1, 2, 3],
-                        [4, 5, 6]])  # 2x3
-
-B_func = create_matrix([[2, 0, 1],
-                        [1, 2, 3]])  # 2x3
-
-C_func = create_matrix([[1, 2],
-                        [3, 4],
-                        [5, 6]])  # 3x2
-
-print("Матрица A (2x3):")
-print(matrix_to_string(A_func))
-print("\nМатрица B (2x3):")
-print(matrix_to_string(B_func))
-print("\nМатрица C (3x2):")
-print(matrix_to_string(C_func))
-
-# Все операции между матрицами
-print("\n" + "=" * 50)
-print("ВСЕ ОПЕРАЦИИ МЕЖДУ МАТРИЦАМИ (Функциональный):")
-print("=" * 50)
-
-# 1. Сложение A + B
-print("\n1. Сложение A + B:")
-result = add_matrices(A_func, B_func)
-print(matrix_to_string(result))
-
-#Попытка сложить A + C
-print("Попытка сложить A + C:")
-result = add_matrices(A_func, C_func)
-print(result)
-
-# 2. Умножение A * C
-print("\n2. Умножение A * C:")
-result = multiply_matrices(A_func, C_func)
-print(matrix_to_string(result))
-
-# Умножение B * C
-print("Умножение B * C:")
-result = multiply_matrices(B_func, C_func)
-print(matrix_to_string(result))
-
-# 3. Умножение на скаляр
-print("\n3. Умножение матрицы A на скаляр 2:")
-result = multiply_scalar(A_func, 2)
-print(matrix_to_string(result))
-
-print("Умножение матрицы B на скаляр 2:")
-result = multiply_scalar(B_func, 2)
-print(matrix_to_string(result))
-
-print("Умножение матрицы C на скаляр 2:")
-result = multiply_scalar(C_func, 2)
-print(matrix_to_string(result))
-
-
-# 4. Транспонирование
-print("\n4. Транспонирование матрицы A:")
-result = transpose_matrix(A_func)
-print(matrix_to_string(result))
-
-print("Транспонирование матрицы B:")
-result = transpose_matrix(B_func)
-print(matrix_to_string(result))
-
-print("Транспонирование матрицы C:")
-result = transpose_matrix(C_func)
-print(matrix_to_string(result))
+# === Пример использования ===
+if __name__ == "__main__":
+    print("\n" + "=" * 50)
+    print("ФУНКЦИОНАЛЬНЫЙ СТИЛЬ")
+    print("=" * 50)
+
+    # Создаем матрицы
+    A_func = create_matrix([[1, 2, 3],
+                            [4, 5, 6]])  # 2x3
+
+    B_func = create_matrix([[2, 0, 1],
+                            [1, 2, 3]])  # 2x3
+
+    C_func = create_matrix([[1, 2],
+                            [3, 4],
+                            [5, 6]])  # 3x2
+
+    print("Матрица A (2x3):")
+    print(matrix_to_string(A_func))
+    print("\nМатрица B (2x3):")
+    print(matrix_to_string(B_func))
+    print("\nМатрица C (3x2):")
+    print(matrix_to_string(C_func))
+
+    # Все операции между матрицами
+    print("\n" + "=" * 50)
+    print("ВСЕ ОПЕРАЦИИ МЕЖДУ МАТРИЦАМИ (Функциональный):")
+    print("=" * 50)
+
+    # 1. Сложение A + B
+    print("\n1. Сложение A + B:")
+    result = add_matrices(A_func, B_func)
+    print(matrix_to_string(result))
+
+    #Попытка сложить A + C
+    print("Попытка сложить A + C:")
+    result = add_matrices(A_func, C_func)
+    print(result)
+
+    # 2. Умножение A * C
+    print("\n2. Умножение A * C:")
+    result = multiply_matrices(A_func, C_func)
+    print(matrix_to_string(result))
+
+    # Умножение B * C
+    print("Умножение B * C:")
+    result = multiply_matrices(B_func, C_func)
+    print(matrix_to_string(result))
+
+    # 3. Умножение на скаляр
+    print("\n3. Умножение матрицы A на скаляр 2:")
+    result = multiply_scalar(A_func, 2)
+    print(matrix_to_string(result))
+
+    print("Умножение матрицы B на скаляр 2:")
+    result = multiply_scalar(B_func, 2)
+    print(matrix_to_string(result))
+
+    print("Умножение матрицы C на скаляр 2:")
+    result = multiply_scalar(C_func, 2)
+    print(matrix_to_string(result))
+
+
+    # 4. Транспонирование
+    print("\n4. Транспонирование матрицы A:")
+    result = transpose_matrix(A_func)
+    print(matrix_to_string(result))
+
+    print("Транспонирование матрицы B:")
+    result = transpose_matrix(B_func)
+    print(matrix_to_string(result))
+
+    print("Транспонирование матрицы C:")
+    result = transpose_matrix(C_func)
+    print(matrix_to_string(result))